@@ -4,10 +4,15 @@ import pandas as pd
 import numpy as np
 from streamlit_extras.app_logo import add_logo
 
-if "data" not in st.session_state:
-    df = pd.read_csv("dados-completos-Ituano.csv")
+from analise.dados import carregar_dados, iniciar_vigia
+from analise.metricas import iniciar_endpoint, medir, painel_lateral
 
-    st.session_state["data"] = df
+# A base é lida uma única vez por processo e compartilhada entre as sessões;
+# a vigia recarrega o cache em segundo plano quando o arquivo muda
+iniciar_vigia()
+iniciar_endpoint()
+with medir("home.carga"):
+    df = carregar_dados()
 
 # Configuração da página
 st.set_page_config(page_title="guilherme Santiago da silva", layout="wide")
@@ -37,3 +42,6 @@ st.write("""
     - **Detalhes do jogador**: nome, número, posição, capitão, se foi substituto.
     - **Estatísticas de desempenho**: minutos jogados, passes, chutes, gols, assistências, desarmes, interceptações, entre outros (total de **71 colunas**).
 """)
+
+# Tempo das etapas (só com ?perfil=1 na URL)
+painel_lateral()
@@ -0,0 +1 @@
+# Funções de apoio compartilhadas entre o Home e as páginas do dashboard
@@ -0,0 +1,100 @@
+import pandas as pd
+
+from analise.esquema import COLUNAS_DECIMAIS
+
+# Dimensões de cada célula da tabela agregada
+DIMENSOES = ["player_name", "home_or_away", "ano"]
+# Casas decimais mantidas nas estatísticas não inteiras (nota, xG, xA) ao somar em ponto fixo
+CASAS_DECIMAIS = 4
+
+
+def colunas_estatisticas(df):
+    return [c for c in df.columns if c.startswith("statistics_")]
+
+
+def _escala(colunas):
+    return pd.Series([10**CASAS_DECIMAIS if c in COLUNAS_DECIMAIS else 1 for c in colunas], index=colunas)
+
+
+def acumular(df, dimensoes=DIMENSOES):
+    """Somas por `dimensoes` em inteiros (ponto fixo), para que blocos possam ser somados em qualquer ordem.
+
+    Como a soma de inteiros é exata, juntar acumulados de partes da base (somar_acumulados)
+    e finalizar dá exatamente o mesmo resultado que acumular a base inteira de uma vez.
+    """
+    colunas = colunas_estatisticas(df)
+    valores = df[colunas].astype("float64")
+    registrado = valores.notna().astype("int64")
+    inteiros = (valores.fillna(0) * _escala(colunas)).round().astype("int64")
+    minutos = df["statistics_minutes_played"].astype("float64").fillna(0).round().astype("int64")
+    blocos = pd.concat(
+        {
+            "soma": inteiros,
+            "n": registrado,
+            "quadrados": inteiros**2,
+            "peso": registrado.mul(minutos, axis=0),
+            "ponderada": inteiros.mul(minutos, axis=0),
+        },
+        axis=1,
+    )
+    return blocos.groupby([df[c] for c in dimensoes], observed=True, dropna=False).sum()
+
+
+def somar_acumulados(*acumulados):
+    juntos = pd.concat(acumulados)
+    return juntos.groupby(level=list(juntos.index.names), observed=True, dropna=False).sum()
+
+
+def finalizar(acumulado):
+    """Converte as somas em ponto fixo de volta para a escala das estatísticas."""
+    escala = _escala(acumulado["soma"].columns)
+    tabela = acumulado.astype("float64")
+    tabela["n"] = acumulado["n"]
+    tabela["soma"] = acumulado["soma"] / escala
+    tabela["quadrados"] = acumulado["quadrados"] / escala**2
+    tabela["ponderada"] = acumulado["ponderada"] / escala
+    return tabela
+
+
+def construir_agregados(df, dimensoes=DIMENSOES):
+    """Estatísticas suficientes de todas as statistics_* por `dimensoes` (por padrão jogador, mando e ano), em uma única passada.
+
+    As colunas saem em dois níveis, (estatística, coluna):
+    - "soma" e "n": soma e número de partidas com valor registrado;
+    - "quadrados": soma dos quadrados (para variância/IC sem reler as linhas);
+    - "peso" e "ponderada": minutos jogados e soma de valor x minutos, nas partidas com valor.
+    Os minutos ficam em ("soma", "statistics_minutes_played").
+    """
+    return finalizar(acumular(df, dimensoes))
+
+
+def atualizar_agregados(tabela, novos):
+    """Soma à tabela existente apenas os agregados das linhas novas, sem reprocessar o histórico."""
+    incremento = construir_agregados(novos)
+    if tabela is None or tabela.empty:
+        return incremento
+
+    # Jogadores/temporadas novos entram como células novas; os existentes são somados
+    atualizada = tabela.add(incremento, fill_value=0)
+    atualizada["n"] = atualizada["n"].astype("int64")
+    return atualizada
+
+
+def filtrar(tabela, **filtros):
+    mascara = pd.Series(True, index=tabela.index)
+    for dimensao, valor in filtros.items():
+        if valor is None:
+            continue
+        valores = valor if isinstance(valor, (list, tuple, set)) else [valor]
+        mascara &= tabela.index.get_level_values(dimensao).isin(valores)
+    return tabela[mascara.to_numpy()]
+
+
+def por_jogador(tabela, home_or_away=None, ano=None):
+    """Consolida a tabela agregada em uma linha por jogador, acrescentando a "media" de cada estatística."""
+    recorte = filtrar(tabela, home_or_away=home_or_away, ano=ano)
+    jogadores = recorte.groupby(level="player_name", observed=True).sum()
+
+    # Média = soma / partidas com registro (NaN para quem nunca teve a estatística)
+    medias = jogadores["soma"] / jogadores["n"]
+    return jogadores.join(pd.concat({"media": medias}, axis=1))
@@ -0,0 +1,127 @@
+"""Banco SQLite opcional com a base ingerida, para consultas avulsas indexadas.
+
+A tabela `partidas` tem as mesmas colunas da base e índices em player_name, ano,
+jogo e player_position. As consultas usam sempre parâmetros (nunca texto montado
+com valores), e cada thread do servidor abre sua própria conexão somente-leitura.
+
+Uso: python -m analise.banco [origem] [-o destino.sqlite] [--bloco LINHAS]
+"""
+import argparse
+import sqlite3
+import threading
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+
+from analise.blocos import LINHAS_POR_BLOCO, ler_em_blocos
+from analise.dados import fonte_padrao
+from analise.particoes import arquivos, ler_particoes
+
+TABELA = "partidas"
+COLUNAS_INDEXADAS = ["player_name", "ano", "jogo", "player_position"]
+
+# Uma conexão por thread e por arquivo (o sqlite3 não compartilha conexões entre threads)
+_conexoes = threading.local()
+
+
+def arquivo_banco(origem):
+    # dados-completos-Ituano.csv -> dados-completos-Ituano.csv.sqlite (o nome inteiro, como nos outros arquivos derivados)
+    origem = Path(origem)
+    return origem.with_name(origem.name + ".sqlite")
+
+
+def _blocos(origem, linhas_por_bloco):
+    origem = Path(origem)
+    if origem.is_dir():
+        # Base particionada: uma partição (clube x temporada) por vez
+        for pasta in sorted({p.parent for p in arquivos(origem)}):
+            yield ler_particoes(pasta)
+    else:
+        yield from ler_em_blocos(origem, linhas_por_bloco)
+
+
+def criar_banco(origem, destino=None, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """Carrega a base em `destino` (substituindo a tabela) e cria os índices. Devolve o número de linhas."""
+    destino = Path(destino or arquivo_banco(origem))
+    linhas = 0
+    # closing fecha a conexão; o `with` da conexão só faz o commit
+    with closing(sqlite3.connect(destino)) as conexao, conexao:
+        conexao.execute(f"DROP TABLE IF EXISTS {TABELA}")
+        for bloco in _blocos(origem, linhas_por_bloco):
+            bloco.columns = bloco.columns.str.strip()
+            bloco.to_sql(TABELA, conexao, if_exists="append", index=False, chunksize=10_000)
+            linhas += len(bloco)
+        # Índices criados depois da carga: inserir sem eles é bem mais rápido
+        for coluna in COLUNAS_INDEXADAS:
+            conexao.execute(f"CREATE INDEX IF NOT EXISTS idx_{TABELA}_{coluna} ON {TABELA} ({coluna})")
+        conexao.execute("ANALYZE")
+    return linhas
+
+
+def conectar(caminho):
+    caminho = Path(caminho).resolve()
+    abertas = getattr(_conexoes, "abertas", None)
+    if abertas is None:
+        abertas = _conexoes.abertas = {}
+    if caminho not in abertas:
+        if not caminho.exists():
+            raise FileNotFoundError(f"{caminho} não existe; crie com `python -m analise.banco`")
+        abertas[caminho] = sqlite3.connect(f"{caminho.as_uri()}?mode=ro", uri=True)
+    return abertas[caminho]
+
+
+def consultar(caminho, sql, parametros=()):
+    """Executa `sql` com `parametros` (sequência para `?` ou dicionário para `:nome`) e devolve um DataFrame."""
+    return pd.read_sql_query(sql, conectar(caminho), params=parametros)
+
+
+def colunas(caminho):
+    return [linha[1] for linha in conectar(caminho).execute(f"PRAGMA table_info({TABELA})")]
+
+
+def selecionar(caminho, campos=None, ordem=None, limite=None, **filtros):
+    """SELECT simples na tabela de partidas, com filtros por igualdade (valor) ou IN (lista).
+
+    Nomes de colunas são conferidos com o esquema do banco; os valores vão sempre como parâmetros.
+    """
+    existentes = set(colunas(caminho))
+    desconhecidas = (set(campos or []) | set(filtros) | set(ordem or [])) - existentes
+    if desconhecidas:
+        raise KeyError(f"colunas inexistentes no banco: {sorted(desconhecidas)}")
+
+    condicoes, parametros = [], []
+    for coluna, valor in filtros.items():
+        if valor is None:
+            continue
+        valores = list(valor) if isinstance(valor, (list, tuple, set)) else [valor]
+        condicoes.append(f'"{coluna}" IN ({", ".join("?" * len(valores))})')
+        parametros.extend(valores)
+
+    lista = ", ".join(f'"{c}"' for c in campos) if campos else "*"
+    sql = f"SELECT {lista} FROM {TABELA}"
+    if condicoes:
+        sql += " WHERE " + " AND ".join(condicoes)
+    if ordem:
+        sql += " ORDER BY " + ", ".join(f'"{c}"' for c in ordem)
+    if limite is not None:
+        sql += " LIMIT ?"
+        parametros.append(int(limite))
+    return consultar(caminho, sql, parametros)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Carrega a base em um banco SQLite indexado.")
+    parser.add_argument("origem", nargs="?", help="base (.csv, .csv.gz, .parquet ou pasta particionada)")
+    parser.add_argument("-o", "--destino", help="arquivo .sqlite (padrão: <arquivo da base>.sqlite)")
+    parser.add_argument("--bloco", type=int, default=LINHAS_POR_BLOCO, help="linhas lidas por vez")
+    args = parser.parse_args(argv)
+
+    origem = args.origem or fonte_padrao()
+    destino = args.destino or arquivo_banco(origem)
+    linhas = criar_banco(origem, destino, args.bloco)
+    print(f"{linhas} linhas carregadas em {destino}")
+
+
+if __name__ == "__main__":
+    main()
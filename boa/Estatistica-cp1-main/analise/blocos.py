@@ -0,0 +1,83 @@
+"""Agregação em blocos, para bases maiores que a memória.
+
+A base (CSV, CSV.gz ou Parquet) é lida em blocos de tamanho fixo. Cada bloco vira
+somas em ponto fixo (analise.agregados.acumular) que são juntadas às do bloco
+anterior. A memória máxima depende do tamanho do bloco e do número de células da
+tabela (jogador x mando x ano), não do tamanho do arquivo. O resultado é idêntico
+ao de construir_agregados sobre a base inteira.
+
+Uso: python -m analise.blocos origem [-o destino.parquet] [--bloco LINHAS]
+"""
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+from analise.agregados import DIMENSOES, acumular, finalizar, somar_acumulados
+from analise.esquema import aplicar_esquema
+
+LINHAS_POR_BLOCO = 500_000
+
+
+def ler_em_blocos(origem, linhas_por_bloco=LINHAS_POR_BLOCO, colunas=None):
+    """Gera DataFrames de até `linhas_por_bloco` linhas. `colunas` pode ser uma lista ou uma função nome -> bool."""
+    origem = Path(origem)
+    if origem.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        arquivo = pq.ParquetFile(origem)
+        if callable(colunas):
+            colunas = [c for c in arquivo.schema_arrow.names if colunas(c.strip())]
+        for lote in arquivo.iter_batches(batch_size=linhas_por_bloco, columns=colunas):
+            yield lote.to_pandas()
+    elif origem.suffix == ".arrow":
+        from analise.mapeado import abrir, para_pandas
+
+        # Fatias do arquivo mapeado: nenhum bloco é copiado antes de ser usado
+        tabela = abrir(origem)
+        if callable(colunas):
+            colunas = [c for c in tabela.column_names if colunas(c.strip())]
+        if colunas:
+            tabela = tabela.select(colunas)
+        for inicio in range(0, tabela.num_rows, linhas_por_bloco):
+            yield para_pandas(tabela.slice(inicio, linhas_por_bloco))
+    else:
+        # A compressão (.gz) é detectada pela extensão
+        usecols = (lambda c: colunas(c.strip())) if callable(colunas) else colunas
+        yield from pd.read_csv(origem, chunksize=linhas_por_bloco, usecols=usecols)
+
+
+def acumular_em_blocos(origem, dimensoes=DIMENSOES, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """Somas em ponto fixo (ver analise.agregados.acumular) da base inteira, lendo só as colunas necessárias, bloco a bloco."""
+    necessarias = lambda coluna: coluna in dimensoes or coluna.startswith("statistics_")
+    acumulado = None
+    for bloco in ler_em_blocos(origem, linhas_por_bloco, necessarias):
+        bloco.columns = bloco.columns.str.strip()
+        parcial = acumular(aplicar_esquema(bloco), dimensoes)
+        acumulado = parcial if acumulado is None else somar_acumulados(acumulado, parcial)
+    if acumulado is None:
+        raise ValueError(f"{origem} não tem linhas")
+    return acumulado
+
+
+def agregar_em_blocos(origem, dimensoes=DIMENSOES, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """Mesma tabela de construir_agregados(base inteira), sem ler a base inteira de uma vez."""
+    return finalizar(acumular_em_blocos(origem, dimensoes, linhas_por_bloco))
+
+
+def main(argv=None):
+    from analise.dados import salvar_agregados
+
+    parser = argparse.ArgumentParser(description="Monta a tabela agregada lendo a base em blocos.")
+    parser.add_argument("origem", help="arquivo .csv, .csv.gz, .parquet ou .arrow")
+    parser.add_argument("-o", "--destino", help="Parquet de saída (padrão: <arquivo da base>.agregados.parquet)")
+    parser.add_argument("--bloco", type=int, default=LINHAS_POR_BLOCO, help="linhas lidas por vez")
+    args = parser.parse_args(argv)
+
+    tabela = agregar_em_blocos(args.origem, linhas_por_bloco=args.bloco)
+    destino = salvar_agregados(args.origem, tabela, args.destino)
+    print(f"{len(tabela)} células gravadas em {destino}")
+
+
+if __name__ == "__main__":
+    main()
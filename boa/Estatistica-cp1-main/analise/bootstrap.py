@@ -0,0 +1,125 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# Limite de elementos por bloco de reamostragem (reamostras x tamanho da amostra)
+ELEMENTOS_POR_BLOCO = 2_000_000
+# Abaixo deste volume de trabalho (linhas x reamostras) o custo de subir processos não compensa
+TRABALHO_MINIMO_PARA_PROCESSOS = 50_000_000
+
+
+def _estatisticas_bootstrap(x, estatistica, n_reamostras, rng):
+    # Reamostra em blocos de matriz (reamostras x n) em vez de um laço por reamostra
+    n = len(x)
+    por_bloco = max(1, ELEMENTOS_POR_BLOCO // n)
+    resultado = np.empty(n_reamostras)
+    for inicio in range(0, n_reamostras, por_bloco):
+        fim = min(inicio + por_bloco, n_reamostras)
+        indices = rng.integers(0, n, size=(fim - inicio, n))
+        resultado[inicio:fim] = estatistica(x[indices], axis=1)
+    return resultado
+
+
+def _jackknife(x, estatistica):
+    # Estatística de cada amostra "deixando um de fora", também em blocos de matriz
+    n = len(x)
+    por_bloco = max(1, ELEMENTOS_POR_BLOCO // n)
+    resultado = np.empty(n)
+    todos = np.arange(n)
+    for inicio in range(0, n, por_bloco):
+        fim = min(inicio + por_bloco, n)
+        fora = np.arange(inicio, fim)
+        # Linha i = índices 0..n-1 sem o i
+        indices = todos[None, : n - 1] + (todos[None, : n - 1] >= fora[:, None])
+        resultado[inicio:fim] = estatistica(x[indices], axis=1)
+    return resultado
+
+
+def bootstrap_ic(amostra, estatistica=np.mean, n_reamostras=2000, confianca=0.95, metodo="percentil", semente=None):
+    """Intervalo de confiança bootstrap ("percentil" ou "bca"); devolve (estimativa, inferior, superior).
+
+    `estatistica` precisa aceitar `axis` (np.mean, np.median...). NaN são ignorados.
+    """
+    x = np.asarray(amostra, dtype="float64")
+    x = x[~np.isnan(x)]
+    if len(x) < 2:
+        return (x[0] if len(x) else np.nan), np.nan, np.nan
+
+    rng = np.random.default_rng(semente)
+    estimativa = estatistica(x)
+    reamostras = _estatisticas_bootstrap(x, estatistica, n_reamostras, rng)
+    alfa = (1 - confianca) / 2
+
+    if metodo == "percentil":
+        inferior, superior = np.quantile(reamostras, [alfa, 1 - alfa])
+        return estimativa, inferior, superior
+    if metodo != "bca":
+        raise ValueError(f"Método desconhecido: {metodo!r} (use 'percentil' ou 'bca')")
+
+    # Amostra sem variação: todas as reamostras são iguais à estimativa
+    if np.all(reamostras == reamostras[0]):
+        return estimativa, estimativa, estimativa
+
+    # Correção de viés (z0) e aceleração (a, via jackknife)
+    proporcao = np.clip(np.mean(reamostras < estimativa), 1 / n_reamostras, 1 - 1 / n_reamostras)
+    z0 = stats.norm.ppf(proporcao)
+    jack = _jackknife(x, estatistica)
+    desvios = jack.mean() - jack
+    denominador = 6 * np.sum(desvios ** 2) ** 1.5
+    a = np.sum(desvios ** 3) / denominador if denominador > 0 else 0.0
+
+    z = stats.norm.ppf([alfa, 1 - alfa])
+    ajustados = stats.norm.cdf(z0 + (z0 + z) / (1 - a * (z0 + z)))
+    inferior, superior = np.quantile(reamostras, ajustados)
+    return estimativa, inferior, superior
+
+
+def _ic_dos_grupos(grupos, estatistica, n_reamostras, confianca, metodo):
+    # grupos: lista de (nome, valores, semente)
+    return [
+        (nome, len(valores), *bootstrap_ic(valores, estatistica, n_reamostras, confianca, metodo, semente))
+        for nome, valores, semente in grupos
+    ]
+
+
+def bootstrap_por_grupo(
+    df,
+    coluna,
+    grupo="player_name",
+    estatistica=np.mean,
+    n_reamostras=2000,
+    confianca=0.95,
+    metodo="percentil",
+    semente=None,
+    processos=None,
+):
+    """IC bootstrap de `coluna` para cada valor de `grupo` (por padrão, cada jogador).
+
+    Cada grupo recebe sua própria semente derivada de `semente`, então o resultado é o
+    mesmo com ou sem processos. Bases grandes são divididas entre um pool de processos.
+    """
+    recorte = df[[grupo, coluna]].dropna()
+    divididos = [
+        (nome, valores[coluna].to_numpy(dtype="float64"))
+        for nome, valores in recorte.groupby(grupo, observed=True)
+    ]
+    sementes = np.random.SeedSequence(semente).spawn(len(divididos))
+    tarefas = [(nome, valores, s) for (nome, valores), s in zip(divididos, sementes)]
+
+    calcular = partial(
+        _ic_dos_grupos, estatistica=estatistica, n_reamostras=n_reamostras, confianca=confianca, metodo=metodo
+    )
+    processos = processos or os.cpu_count() or 1
+    if processos == 1 or len(recorte) * n_reamostras < TRABALHO_MINIMO_PARA_PROCESSOS:
+        linhas = calcular(tarefas)
+    else:
+        lotes = [tarefas[i::processos] for i in range(processos)]
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            linhas = [linha for parte in pool.map(calcular, lotes) for linha in parte]
+
+    resultado = pd.DataFrame(linhas, columns=[grupo, "n", "estimativa", "inferior", "superior"])
+    return resultado.set_index(grupo).sort_index()
@@ -0,0 +1,95 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from analise.agregados import construir_agregados, filtrar
+
+# Dimensões do cubo, da mais grossa para a mais fina
+DIMENSOES_CUBO = ["time_alvo", "ano", "tournament", "home_or_away", "player_position", "adversario"]
+# Orçamento para as agregações intermediárias (a base do cubo não entra na conta)
+LIMITE_BYTES_PADRAO = 256 * 1024 * 1024
+
+
+def com_adversario(df):
+    # Adversário = o time que não é o alvo da análise naquela partida
+    adversario = np.where(df["home_or_away"] == "home", df["away_team"], df["home_team"])
+    return df.assign(adversario=pd.Categorical(adversario))
+
+
+def _total(tabela):
+    # Uma única linha com a soma de todas as células (o "n" volta a ser inteiro)
+    total = tabela.sum().to_frame().T
+    total["n"] = total["n"].astype("int64")
+    return total
+
+
+class Cubo:
+    """Cubo OLAP das estatísticas suficientes (soma, n, quadrados, peso, ponderada) de todas as statistics_*.
+
+    A base (todas as dimensões) é montada na criação. Cada combinação mais grossa de
+    dimensões só é materializada quando alguma consulta precisa dela, a partir da menor
+    agregação já existente que a contém, e fica num cache LRU limitado por `limite_bytes`.
+    """
+
+    def __init__(self, df, dimensoes=DIMENSOES_CUBO, limite_bytes=LIMITE_BYTES_PADRAO):
+        self.dimensoes = [d for d in dimensoes if d in df.columns or d == "adversario"]
+        self.limite_bytes = limite_bytes
+        self.base = construir_agregados(com_adversario(df), self.dimensoes)
+        self._agregacoes = OrderedDict()
+        self._bytes = 0
+        self._trava = threading.Lock()
+
+    def _agregacao(self, dimensoes):
+        dimensoes = tuple(d for d in self.dimensoes if d in dimensoes)
+        if len(dimensoes) == len(self.dimensoes):
+            return self.base
+
+        with self._trava:
+            if dimensoes in self._agregacoes:
+                self._agregacoes.move_to_end(dimensoes)
+                return self._agregacoes[dimensoes]
+
+            # Parte da menor agregação já materializada que contém todas as dimensões pedidas
+            candidatas = [t for chave, t in self._agregacoes.items() if set(dimensoes) <= set(chave)]
+            origem = min(candidatas, key=len, default=self.base)
+            if dimensoes:
+                tabela = origem.groupby(level=list(dimensoes), observed=True, dropna=False).sum()
+            else:
+                tabela = _total(origem)
+
+            self._agregacoes[dimensoes] = tabela
+            self._bytes += int(tabela.memory_usage(deep=True).sum())
+            while self._bytes > self.limite_bytes and len(self._agregacoes) > 1:
+                _, removida = self._agregacoes.popitem(last=False)
+                self._bytes -= int(removida.memory_usage(deep=True).sum())
+            return tabela
+
+    def consultar(self, por=(), **filtros):
+        """Agrega o cubo pelas dimensões `por` depois de aplicar os filtros (valor ou lista por dimensão).
+
+        Roll-up = tirar uma dimensão de `por`; drill-down = acrescentar uma. Sem `por`, devolve o total.
+        """
+        filtros = {d: v for d, v in filtros.items() if v is not None}
+        tabela = self._agregacao(set(por) | set(filtros))
+        recorte = filtrar(tabela, **filtros) if filtros else tabela
+        if not por:
+            return _total(recorte)
+        if set(recorte.index.names) == set(por):
+            return recorte
+        return recorte.groupby(level=list(por), observed=True, dropna=False).sum()
+
+    def valores(self, dimensao):
+        """Valores de `dimensao` presentes na base, ordenados (as opções dos filtros das páginas)."""
+        return sorted(self.base.index.get_level_values(dimensao).dropna().unique())
+
+    def tamanho(self):
+        with self._trava:
+            return {
+                "celulas_base": len(self.base),
+                "bytes_base": int(self.base.memory_usage(deep=True).sum()),
+                "agregacoes": len(self._agregacoes),
+                "bytes_agregacoes": self._bytes,
+                "limite_bytes": self.limite_bytes,
+            }
@@ -0,0 +1,322 @@
+import json
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from analise.agregados import DIMENSOES, construir_agregados
+from analise.blocos import agregar_em_blocos
+from analise.cubo import Cubo, com_adversario
+from analise.esquema import aplicar_esquema, relatorio_memoria
+from analise.forma import COLUNAS_FORMA, Tendencias, partidas_jogadas
+from analise.graficos import cache_graficos
+from analise.indices import construir_indices
+from analise.mapeado import ler_mapeado
+from analise.metricas import medir
+from analise.particoes import ler_particoes
+from analise.por90 import DIMENSOES_POR_90, Por90
+from analise.versao import Vigia, impressao_digital
+
+# Pasta do app (onde ficam o Home.py e a base de dados)
+RAIZ = Path(__file__).resolve().parent.parent
+ARQUIVO_PADRAO = RAIZ / "dados-completos-Ituano.csv"
+# Gerado por `python -m analise.ingestao dados-completos-Ituano.csv`
+ARQUIVO_COLUNAR = RAIZ / "dados-completos-Ituano.parquet"
+# Gerado por `python -m analise.ingestao dados-completos-Ituano.csv -o dados-completos-Ituano.arrow`
+ARQUIVO_MAPEADO = RAIZ / "dados-completos-Ituano.arrow"
+# Gerada por `python -m analise.particoes dados-completos-Ituano.csv dados-particionados`
+PASTA_PARTICIONADA = RAIZ / "dados-particionados"
+
+# No pandas 2 o copy-on-write é opcional; ativamos para que nenhuma sessão altere o frame compartilhado
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# Cache do processo: um único DataFrame por arquivo, compartilhado por todas as sessões.
+# Cada entrada guarda (versão dos dados, objeto) e a função que a monta, para reconstruí-la quando a base muda.
+_cache = {}
+_receitas = {}
+_trava = threading.RLock()
+# Uma trava por chave, segurada enquanto a entrada é montada (fora da trava global)
+_montando = {}
+_contadores = {"hits": 0, "misses": 0}
+# Memória (bytes) de cada arquivo lido, antes e depois de aplicar o esquema compacto
+_memoria = {}
+
+
+def fonte_padrao():
+    # Prefere a base particionada, depois o Arrow mapeado e o Parquet gerados pela ingestão e, sem eles, o CSV original
+    if PASTA_PARTICIONADA.is_dir():
+        return PASTA_PARTICIONADA
+    if ARQUIVO_MAPEADO.exists():
+        return ARQUIVO_MAPEADO
+    return ARQUIVO_COLUNAR if ARQUIVO_COLUNAR.exists() else ARQUIVO_PADRAO
+
+
+def versao_dos_dados(caminho=None):
+    """Impressão digital da base (nome, tamanho e hash do conteúdo; ver analise.versao).
+
+    É a chave de versão de tudo que é derivado da base: frames, agregados, perguntas e gráficos.
+    """
+    return impressao_digital(Path(caminho or fonte_padrao()).resolve())
+
+
+def _ler_arquivo(caminho, colunas=None):
+    with medir("dados.leitura"):
+        if caminho.is_dir():
+            df = ler_particoes(caminho, colunas)
+        elif caminho.suffix == ".arrow":
+            # Compartilhado entre os processos pelo cache de páginas do sistema (ver analise.mapeado)
+            df = ler_mapeado(caminho, colunas)
+        elif caminho.suffix == ".parquet":
+            df = pd.read_parquet(caminho, columns=colunas)
+        else:
+            df = pd.read_csv(caminho, usecols=colunas)
+
+    # Normaliza nomes de colunas (caso haja espaços extras)
+    df.columns = df.columns.str.strip()
+    with medir("dados.tipos"):
+        tipado = aplicar_esquema(df)
+    _memoria[caminho.name, tuple(colunas) if colunas else None] = relatorio_memoria(df, tipado)
+    return tipado
+
+
+def _versao_atual(caminho):
+    # Com a vigia ligada, vale a última versão que ela conferiu (sem stat nem hash a cada acesso)
+    versao = _vigia.versao(caminho) if _vigia.ativo() else None
+    if versao is None:
+        versao = versao_dos_dados(caminho)
+        _vigia.observar(caminho, versao)
+    return versao
+
+
+def versao_atual(caminho=None):
+    """Versão da base para as chaves das páginas (gráficos): a última conferida pela vigia, sem reler o disco a cada rerun."""
+    return _versao_atual(Path(caminho or fonte_padrao()).resolve())
+
+
+def _entregar(df):
+    # Cópia rasa: cada sessão recebe seu próprio objeto, mas os dados continuam compartilhados
+    if isinstance(df, pd.DataFrame):
+        return df.copy(deep=False)
+    return df
+
+
+def _obter(chave, construir):
+    # Toda chave começa pelo caminho da base; a entrada só vale para a versão atual dela
+    versao = _versao_atual(chave[0])
+    with _trava:
+        guardado = _cache.get(chave)
+        if guardado is not None and guardado[0] == versao:
+            _contadores["hits"] += 1
+            return _entregar(guardado[1])
+        montando = _montando.setdefault(chave, threading.Lock())
+
+    # Monta fora da trava global, para não parar as outras chaves; quem pede a mesma chave espera por ela
+    with montando:
+        with _trava:
+            guardado = _cache.get(chave)
+        if guardado is not None and guardado[0] == versao:
+            with _trava:
+                _contadores["hits"] += 1
+            return _entregar(guardado[1])
+        with _trava:
+            _contadores["misses"] += 1
+        df = construir()
+        with _trava:
+            _cache[chave] = (versao, df)
+            _receitas[chave] = construir
+    return _entregar(df)
+
+
+def carregar_dados(caminho=None, colunas=None):
+    """Devolve uma visão somente-leitura da base, lendo o arquivo uma única vez por processo.
+
+    Com `colunas`, só essas colunas são lidas do disco (e cacheadas separadamente).
+    """
+    caminho = Path(caminho or fonte_padrao()).resolve()
+    colunas = list(colunas) if colunas else None
+    chave = (caminho, "bruto", tuple(colunas) if colunas else None)
+    return _obter(chave, lambda: _ler_arquivo(caminho, colunas))
+
+
+def carregar_frame_analitico(caminho=None, colunas=None):
+    """Como carregar_dados: as colunas statistics_* já saem numéricas da leitura (esquema compacto)."""
+    return carregar_dados(caminho, colunas)
+
+
+def calcular_maximos(df):
+    """Máximo de cada statistics_* por posição, mais a linha "Todas" com o máximo geral."""
+    colunas = [c for c in df.columns if c.startswith("statistics_")]
+    maximos = df.groupby("player_position", observed=True)[colunas].max()
+    maximos.loc["Todas"] = df[colunas].max()
+    return maximos
+
+
+def carregar_maximos_por_posicao(caminho=None):
+    """Máximo de cada statistics_* por posição (e na linha "Todas"), calculado uma vez por processo."""
+    caminho = Path(caminho or fonte_padrao()).resolve()
+    return _obter((caminho, "maximos", None), lambda: calcular_maximos(carregar_dados(caminho)))
+
+
+def carregar_indices(caminho=None):
+    """Índices de filtro (valor -> posições das linhas) das colunas categóricas, montados uma vez por processo.
+
+    As posições valem para qualquer frame da mesma base, com todas ou só algumas colunas.
+    """
+    caminho = Path(caminho or fonte_padrao()).resolve()
+    return _obter((caminho, "indices", None), lambda: construir_indices(com_adversario(carregar_dados(caminho))))
+
+
+def arquivo_agregados(caminho):
+    # dados-completos-Ituano.csv -> dados-completos-Ituano.csv.agregados.parquet
+    # (o nome inteiro, para que .csv, .parquet e .arrow da mesma base não dividam o arquivo)
+    caminho = Path(caminho)
+    return caminho.with_name(caminho.name + ".agregados.parquet")
+
+
+def pasta_resultados(caminho):
+    # dados-completos-Ituano.csv -> dados-completos-Ituano.csv.resultados/ (gerada por `python -m analise.lote`)
+    caminho = Path(caminho)
+    return caminho.with_name(caminho.name + ".resultados")
+
+
+# Chave, nos metadados do Parquet, da versão da base de que a tabela agregada saiu
+METADADO_VERSAO = b"analise.versao_da_base"
+
+
+def salvar_agregados(caminho, tabela, destino=None):
+    """Grava a tabela agregada (por padrão ao lado da base), marcada com a versão atual da base."""
+    arrow = pa.Table.from_pandas(tabela)
+    metadados = {**(arrow.schema.metadata or {}), METADADO_VERSAO: json.dumps(list(versao_dos_dados(caminho))).encode()}
+    destino = Path(destino or arquivo_agregados(caminho))
+    pq.write_table(arrow.replace_schema_metadata(metadados), destino, compression="zstd")
+    return destino
+
+
+def _versao_gravada(arquivo):
+    # Só o esquema é lido; tabelas gravadas sem a marca não valem para versão nenhuma
+    if not arquivo.exists():
+        return None
+    gravada = (pq.read_schema(arquivo).metadata or {}).get(METADADO_VERSAO)
+    return tuple(json.loads(gravada)) if gravada else None
+
+
+def _montar_agregados(caminho, dimensoes=DIMENSOES):
+    # Usa a tabela gravada pela ingestão (só a padrão) se ela saiu desta mesma versão da base
+    salvo = arquivo_agregados(caminho)
+    if dimensoes == DIMENSOES and _versao_gravada(salvo) == versao_dos_dados(caminho):
+        return pd.read_parquet(salvo)
+    if caminho.is_dir():
+        df = carregar_frame_analitico(caminho)
+        with medir("dados.agregados"):
+            return construir_agregados(df, dimensoes)
+    # Arquivo único: lido em blocos, sem precisar da base inteira na memória
+    with medir("dados.agregados"):
+        return agregar_em_blocos(caminho, dimensoes)
+
+
+def carregar_agregados(caminho=None, dimensoes=None):
+    """Tabela agregada por jogador x mando x ano, ou por `dimensoes` (ver analise.agregados), montada uma vez por processo."""
+    caminho = Path(caminho or fonte_padrao()).resolve()
+    dimensoes = list(dimensoes or DIMENSOES)
+    extra = None if dimensoes == DIMENSOES else tuple(dimensoes)
+    return _obter((caminho, "agregados", extra), lambda: _montar_agregados(caminho, dimensoes))
+
+
+def _montar_pergunta(caminho, nome):
+    # Importados aqui para não pesar no import das páginas que não usam as perguntas
+    from analise.lote import TODOS, ler_resultado
+    from analise.perguntas import PERGUNTAS
+
+    # Usa o resultado pré-calculado pelo lote enquanto ele for da versão atual da base
+    resultado = ler_resultado(pasta_resultados(caminho), TODOS, nome, versao_dos_dados(caminho))
+    if resultado is None:
+        tabela = carregar_agregados(caminho)
+        with medir(f"pergunta.{nome}"):
+            resultado = PERGUNTAS[nome](tabela)
+    return resultado
+
+
+def carregar_pergunta(nome, caminho=None):
+    """Resultado da pergunta `nome` (ver analise.perguntas.PERGUNTAS) para a base inteira, uma vez por processo."""
+    caminho = Path(caminho or fonte_padrao()).resolve()
+    return _obter((caminho, "pergunta", nome), lambda: _montar_pergunta(caminho, nome))
+
+
+def carregar_por_90(caminho=None):
+    """Taxas por 90 minutos de todas as statistics_* por clube e jogador (ver analise.por90), uma vez por versão da base."""
+    caminho = Path(caminho or fonte_padrao()).resolve()
+    return _obter((caminho, "por90", None), lambda: Por90(carregar_agregados(caminho, DIMENSOES_POR_90)))
+
+
+def _montar_tendencias(caminho):
+    partidas = partidas_jogadas(carregar_dados(caminho, COLUNAS_FORMA))
+    with _trava:
+        guardado = _cache.get((caminho, "tendencias", None))
+    if guardado is not None:
+        # Base só recebeu partidas novas: calcula apenas as janelas do fim de cada série
+        try:
+            return guardado[1].atualizar(partidas)
+        except ValueError:
+            pass
+    return Tendencias().atualizar(partidas)
+
+
+def carregar_tendencias(caminho=None):
+    """Forma móvel e exponencial por jogador e por clube (ver analise.forma), atualizada só no fim quando a base cresce."""
+    caminho = Path(caminho or fonte_padrao()).resolve()
+    return _obter((caminho, "tendencias", None), lambda: _montar_tendencias(caminho))
+
+
+def carregar_cubo(caminho=None):
+    """Cubo OLAP (ver analise.cubo) das dimensões de filtro da barra lateral, montado uma vez por processo."""
+    caminho = Path(caminho or fonte_padrao()).resolve()
+    return _obter((caminho, "cubo", None), lambda: Cubo(carregar_frame_analitico(caminho)))
+
+
+def registrar_anexo(caminho, agregados):
+    """Após um anexo, descarta os frames em cache da base e guarda a tabela agregada já atualizada."""
+    caminho = Path(caminho).resolve()
+    with _trava:
+        # As tendências ficam: na próxima leitura só as partidas novas são calculadas a partir delas
+        for chave in [c for c in _cache if c[0] == caminho and c[1] != "tendencias"]:
+            del _cache[chave]
+            _receitas.pop(chave, None)
+        _cache[caminho, "agregados", None] = (versao_dos_dados(caminho), agregados)
+        _receitas[caminho, "agregados", None] = lambda: _montar_agregados(caminho)
+    # A vigia passa a conhecer a versão nova já agora, em vez de na próxima volta
+    _vigia.verificar()
+
+
+def estatisticas_cache():
+    with _trava:
+        return {**_contadores, "frames": len(_cache), "memoria": dict(_memoria)}
+
+
+def _ao_mudar(caminho, antiga, nova):
+    """Chamada pela vigia quando a base muda: descarta o que era da versão antiga e remonta em segundo plano."""
+    with _trava:
+        receitas = {chave: construir for chave, construir in _receitas.items() if chave[0] == caminho}
+    cache_graficos.descartar(lambda chave: antiga in chave)
+    # Aquece: cada entrada que existia é remontada já com a versão nova, antes da próxima visita
+    for chave, construir in receitas.items():
+        _obter(chave, construir)
+
+
+_vigia = Vigia(_ao_mudar)
+
+
+def iniciar_vigia():
+    """Liga (uma vez por processo) a thread que invalida e reaquece o cache quando a base muda no disco."""
+    _vigia.iniciar()
+
+
+def limpar_cache():
+    with _trava:
+        _cache.clear()
+        _receitas.clear()
+        _memoria.clear()
+        _contadores["hits"] = 0
+        _contadores["misses"] = 0
@@ -0,0 +1,76 @@
+import pandas as pd
+
+# Strings que se repetem em todas as linhas: guardadas como categoria
+COLUNAS_CATEGORICAS = [
+    "time_alvo",
+    "home_or_away",
+    "home_team",
+    "away_team",
+    "stadium",
+    "tournament",
+    "home_manager",
+    "away_manager",
+    "player_name",
+    "player_position",
+]
+
+# Estatísticas com casas decimais (nota e expected goals/assists)
+COLUNAS_DECIMAIS = [
+    "statistics_rating",
+    "statistics_expected_goals",
+    "statistics_expected_assists",
+]
+
+# Tipo compacto de cada coluna da base. As contagens statistics_* usam inteiros
+# anuláveis porque o "NA" da base significa "evento não registrado no jogo".
+ESQUEMA = {
+    **{coluna: "category" for coluna in COLUNAS_CATEGORICAS},
+    **{coluna: "float32" for coluna in COLUNAS_DECIMAIS},
+    "ano": "Int16",
+    "jogo": "Int16",
+    "home_score": "Int8",
+    "away_score": "Int8",
+    "player_number": "Int8",
+    "player_sub": "boolean",
+    "player_captain": "boolean",
+}
+# Demais colunas statistics_* são contagens
+TIPO_CONTAGEM = "Int16"
+# Mesmo tipo compacto nas colunas lidas do Arrow mapeado (analise.mapeado); convertê-las copiaria os dados
+TIPOS_ARROW = {"Int8": "int8[pyarrow]", "Int16": "int16[pyarrow]", "float32": "float[pyarrow]", "boolean": "bool[pyarrow]"}
+
+
+def tipo_da_coluna(coluna):
+    if coluna in ESQUEMA:
+        return ESQUEMA[coluna]
+    if coluna.startswith("statistics_"):
+        return TIPO_CONTAGEM
+    return None
+
+
+def aplicar_esquema(df):
+    """Converte cada coluna conhecida para o tipo compacto declarado no ESQUEMA."""
+    tipado = df.copy(deep=False)
+    for coluna in tipado.columns:
+        tipo = tipo_da_coluna(coluna)
+        if tipo is None or str(tipado[coluna].dtype) in (tipo, TIPOS_ARROW.get(tipo)):
+            continue
+        serie = tipado[coluna]
+        if tipo not in ("category", "boolean"):
+            serie = pd.to_numeric(serie, errors="coerce")
+        tipado[coluna] = serie.astype(tipo)
+    return tipado
+
+
+def memoria(df):
+    # Bytes ocupados, contando o conteúdo real das strings
+    return int(df.memory_usage(deep=True).sum())
+
+
+def relatorio_memoria(antes, depois):
+    bytes_antes, bytes_depois = memoria(antes), memoria(depois)
+    return {
+        "antes": bytes_antes,
+        "depois": bytes_depois,
+        "reducao": bytes_antes / bytes_depois if bytes_depois else 1.0,
+    }
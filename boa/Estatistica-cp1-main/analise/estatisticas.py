@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import stats
+
+from analise.agregados import filtrar
+
+# Limite de elementos (permutações x observações) gerados por bloco
+ELEMENTOS_POR_BLOCO = 2_000_000
+# Permutações feitas antes de qualquer parada antecipada (com amostras grandes, um bloco tem poucas)
+PERMUTACOES_MINIMAS = 1000
+
+
+@dataclass(frozen=True)
+class Momentos:
+    """Estatísticas suficientes de uma amostra; duas partições se juntam somando os campos."""
+
+    n: float = 0
+    soma: float = 0.0
+    quadrados: float = 0.0
+    # Ponderação pelos minutos jogados
+    peso: float = 0.0
+    ponderada: float = 0.0
+
+    def __add__(self, outro):
+        return Momentos(
+            self.n + outro.n,
+            self.soma + outro.soma,
+            self.quadrados + outro.quadrados,
+            self.peso + outro.peso,
+            self.ponderada + outro.ponderada,
+        )
+
+    @property
+    def media(self):
+        return self.soma / self.n
+
+    @property
+    def variancia(self):
+        # Variância amostral (ddof=1), igual a np.var(amostra, ddof=1)
+        return (self.quadrados - self.soma ** 2 / self.n) / (self.n - 1)
+
+    @property
+    def desvio(self):
+        return np.sqrt(self.variancia)
+
+    @property
+    def media_ponderada(self):
+        return self.ponderada / self.peso
+
+
+def momentos(amostra, pesos=None):
+    """Momentos de uma amostra avulsa (NaN ignorados); `pesos` normalmente são os minutos jogados."""
+    valores = np.asarray(amostra, dtype="float64")
+    presentes = ~np.isnan(valores)
+    x = valores[presentes]
+    if pesos is None:
+        return Momentos(len(x), x.sum(), (x ** 2).sum())
+
+    w = np.asarray(pesos, dtype="float64")[presentes]
+    com_peso = ~np.isnan(w)
+    return Momentos(len(x), x.sum(), (x ** 2).sum(), w[com_peso].sum(), (x * w)[com_peso].sum())
+
+
+def momentos_do_recorte(tabela, coluna, **filtros):
+    """Junta os momentos de `coluna` de todas as células da tabela agregada que passam nos filtros."""
+    recorte = filtrar(tabela, **filtros)
+    return Momentos(
+        *(recorte[nivel, coluna].sum() for nivel in ("n", "soma", "quadrados", "peso", "ponderada"))
+    )
+
+
+def media_ponderada(m):
+    return m.media_ponderada
+
+
+def intervalo_confianca(m, confianca=0.95):
+    z = stats.norm.ppf((1 + confianca) / 2)
+    erro = z * m.desvio / np.sqrt(m.n)
+    return m.media, m.media - erro, m.media + erro
+
+
+def teste_t(m1, m2):
+    # Teste t de Welch (variâncias diferentes), igual a stats.ttest_ind(..., equal_var=False)
+    v1, v2 = m1.variancia / m1.n, m2.variancia / m2.n
+    t_stat = (m1.media - m2.media) / np.sqrt(v1 + v2)
+    graus = (v1 + v2) ** 2 / (v1 ** 2 / (m1.n - 1) + v2 ** 2 / (m2.n - 1))
+    p_value = 2 * stats.t.sf(abs(t_stat), graus)
+    return t_stat, p_value
+
+
+def teste_permutacao(
+    amostra_1, amostra_2, n_permutacoes=10000, alfa=0.05, semente=None, confianca_parada=0.999,
+    minimo_permutacoes=PERMUTACOES_MINIMAS,
+):
+    """Teste de permutação bilateral para a diferença de médias; devolve (diferenca, p_value, permutacoes_feitas).
+
+    As permutações são geradas em blocos, como uma matriz de rótulos embaralhados. A partir de
+    `minimo_permutacoes`, depois de cada bloco, se o intervalo de Clopper-Pearson do p-valor já
+    está inteiro acima ou abaixo de `alfa`, o teste para antes de chegar a `n_permutacoes`.
+    """
+    x1 = np.asarray(amostra_1, dtype="float64")
+    x2 = np.asarray(amostra_2, dtype="float64")
+    x1, x2 = x1[~np.isnan(x1)], x2[~np.isnan(x2)]
+    n1, n2 = len(x1), len(x2)
+    juntos = np.concatenate([x1, x2])
+    total = juntos.sum()
+    observada = x1.mean() - x2.mean()
+
+    rng = np.random.default_rng(semente)
+    rotulos = np.zeros(n1 + n2)
+    rotulos[:n1] = 1
+    por_bloco = max(1, ELEMENTOS_POR_BLOCO // (n1 + n2))
+
+    feitas = extremos = 0
+    while feitas < n_permutacoes:
+        bloco = min(por_bloco, n_permutacoes - feitas)
+        # Cada linha é uma permutação dos rótulos; a soma do grupo 1 sai de um produto matriz-vetor
+        matriz = rng.permuted(np.tile(rotulos, (bloco, 1)), axis=1)
+        soma_1 = matriz @ juntos
+        diferencas = soma_1 / n1 - (total - soma_1) / n2
+        extremos += np.count_nonzero(np.abs(diferencas) >= abs(observada) - 1e-12)
+        feitas += bloco
+
+        # Parada antecipada: decisão já clara em relação a alfa
+        if feitas < minimo_permutacoes:
+            continue
+        cauda = (1 - confianca_parada) / 2
+        inferior = stats.beta.ppf(cauda, extremos, feitas - extremos + 1) if extremos else 0.0
+        superior = stats.beta.ppf(1 - cauda, extremos + 1, feitas - extremos)
+        if superior < alfa or inferior > alfa:
+            break
+
+    p_value = (extremos + 1) / (feitas + 1)
+    return observada, p_value, feitas
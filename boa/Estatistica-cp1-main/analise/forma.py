@@ -0,0 +1,193 @@
+"""Forma recente de cada jogador e de cada clube, partida a partida, na ordem (ano, jogo).
+
+Cada métrica é uma razão entre numerador e denominador por partida jogada:
+
+    nota          nota / partidas com nota
+    xg            xG / partidas
+    ga_por_90     (gols + assistências) x 90 / minutos
+    passe_certo   passes certos x 100 / passes tentados
+
+A média móvel soma numerador e denominador nas últimas `janela` partidas. A
+exponencial (EWM) pesa cada partida por (1 - alfa)^k, k partidas atrás. As duas
+são calculadas numa única passada sobre todas as linhas (somas acumuladas por
+grupo e uma recorrência linear do scipy), sem laço por jogador.
+
+Cada Forma guarda, por grupo, as últimas `janela` partidas e as somas da EWM.
+Quando a base recebe partidas novas, só elas são calculadas a partir desse estado.
+Uma impressão digital das linhas já calculadas confere que o que veio antes não
+mudou (nota corrigida, jogador incluído numa partida antiga); se mudou, a forma
+é recalculada do zero.
+"""
+import numpy as np
+import pandas as pd
+
+# Colunas da base usadas pelas métricas
+COLUNAS_FORMA = [
+    "time_alvo", "ano", "jogo", "player_name",
+    "statistics_minutes_played", "statistics_rating", "statistics_expected_goals",
+    "statistics_goals", "statistics_goal_assist", "statistics_accurate_pass", "statistics_total_pass",
+]
+METRICAS = ["nota", "xg", "ga_por_90", "passe_certo"]
+ORDEM = ["ano", "jogo"]
+JANELA_PADRAO = 5
+ALFA_PADRAO = 0.3
+
+
+def _valores():
+    return [f"{metrica}_{parte}" for metrica in METRICAS for parte in ("num", "den")]
+
+
+def partidas_jogadas(df):
+    """Numerador e denominador de cada métrica, uma linha por jogador em cada partida em que entrou em campo."""
+    minutos = df["statistics_minutes_played"].astype("float64")
+    df, minutos = df[minutos > 0], minutos[minutos > 0]
+    valor = lambda coluna: df[coluna].astype("float64").fillna(0)
+    nota = df["statistics_rating"].astype("float64")
+    return pd.DataFrame({
+        "time_alvo": df["time_alvo"].astype(str),
+        "player_name": df["player_name"].astype(str),
+        "ano": df["ano"].astype("int64"),
+        "jogo": df["jogo"].astype("int64"),
+        "nota_num": nota.fillna(0),
+        "nota_den": nota.notna().astype("float64"),
+        "xg_num": valor("statistics_expected_goals"),
+        "xg_den": 1.0,
+        "ga_por_90_num": (valor("statistics_goals") + valor("statistics_goal_assist")) * 90,
+        "ga_por_90_den": minutos,
+        "passe_certo_num": valor("statistics_accurate_pass") * 100,
+        "passe_certo_den": valor("statistics_total_pass"),
+    }).reset_index(drop=True)
+
+
+def por_clube(partidas):
+    """Soma dos numeradores e denominadores de todos os jogadores em cada partida do clube."""
+    return partidas.groupby(["time_alvo", *ORDEM], sort=False)[_valores()].sum().reset_index()
+
+
+def _posicao(df):
+    # (ano, jogo) como um único número crescente
+    return df["ano"] * 100_000 + df["jogo"]
+
+
+def _impressao(linhas, colunas):
+    # Soma (módulo 2^64) do hash de cada linha: não depende da ordem e pode ser acumulada a cada anexo
+    return int(pd.util.hash_pandas_object(linhas[colunas], index=False).sum())
+
+
+class Forma:
+    """Médias móveis e exponenciais das METRICAS por grupo (`chave`: jogador ou clube).
+
+    Imutável: anexar devolve uma nova Forma, então sessões que ainda usam a anterior não são afetadas.
+    """
+
+    def __init__(self, chave, janela=JANELA_PADRAO, alfa=ALFA_PADRAO):
+        self.chave = list(chave)
+        self.janela = janela
+        self.alfa = alfa
+        self.linhas = 0
+        self.impressao = 0
+        # chave + ano + jogo + <metrica>_movel + <metrica>_ewm, uma linha por partida do grupo
+        self.tabela = pd.DataFrame(columns=[*self.chave, *ORDEM, *self._saidas()])
+        # Estado de cada grupo: últimas `janela` partidas, somas da EWM e posição da última partida
+        self._cauda = pd.DataFrame(columns=[*self.chave, *_valores()])
+        self._ewm = pd.DataFrame(columns=_valores(), index=pd.MultiIndex.from_tuples([], names=self.chave))
+        self._ultima = pd.Series(dtype="int64", index=self._ewm.index)
+
+    def _saidas(self):
+        return [f"{metrica}_{tipo}" for metrica in METRICAS for tipo in ("movel", "ewm")]
+
+    def _grupos(self, df):
+        return pd.MultiIndex.from_frame(df[self.chave])
+
+    def _impressao(self, linhas):
+        return _impressao(linhas, [*self.chave, *ORDEM, *_valores()])
+
+    def novas(self, partidas):
+        """As partidas posteriores à última já calculada de cada grupo.
+
+        ValueError se a parte já vista não for exatamente a calculada antes (base reescrita, não só anexada).
+        """
+        ultima = self._ultima.reindex(self._grupos(partidas)).to_numpy()
+        nova = ~(_posicao(partidas).to_numpy() <= ultima)
+        vistas = partidas[~nova]
+        if len(vistas) != self.linhas or self._impressao(vistas) != self.impressao:
+            raise ValueError("a base mudou além de partidas anexadas; recalcule a forma do zero")
+        return partidas[nova]
+
+    def _somas_ewm(self, novas, grupos):
+        from scipy.signal import lfilter
+
+        # Uma única recorrência sobre todas as linhas (em C); no início de cada grupo, troca o que
+        # veio do grupo anterior pelas somas guardadas do próprio grupo, já decaídas
+        fator = 1 - self.alfa
+        globais = lfilter([1.0], [1.0, -fator], novas[_valores()].to_numpy("float64"), axis=0)
+        ids = novas.groupby(self.chave, sort=False).ngroup().to_numpy()
+        inicios = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        vindas = np.zeros((len(inicios), globais.shape[1]))
+        vindas[1:] = globais[inicios[1:] - 1]
+        decaimento = fator ** (np.arange(len(ids)) - inicios[ids] + 1)
+        anteriores = self._ewm.reindex(grupos).fillna(0).to_numpy("float64")
+        return globais - decaimento[:, None] * (vindas[ids] - anteriores)
+
+    def anexar(self, partidas):
+        """Nova Forma com `partidas` calculadas a partir do estado guardado de cada grupo."""
+        if partidas.empty:
+            return self
+        novas = partidas.sort_values([*self.chave, *ORDEM], kind="stable").reset_index(drop=True)
+        grupos = self._grupos(novas)
+        if (_posicao(novas).to_numpy() <= self._ultima.reindex(grupos).to_numpy()).any():
+            raise ValueError("partidas anteriores à última já calculada do grupo")
+        valores = _valores()
+
+        # Média móvel: somas acumuladas por grupo, com a cauda guardada à frente das partidas novas
+        juntas = pd.concat([self._cauda, novas[[*self.chave, *valores]]], ignore_index=True)
+        juntas = juntas.sort_values(self.chave, kind="stable")
+        ids = juntas.groupby(self.chave, sort=False).ngroup()
+        acumulado = juntas[valores].astype("float64").groupby(ids).cumsum()
+        janela = acumulado - acumulado.groupby(ids).shift(self.janela, fill_value=0)
+        janela = janela[juntas.index >= len(self._cauda)].sort_index()
+        janela.index = novas.index
+
+        # EWM: somas S_t = (1 - alfa) S_t-1 + x_t, continuando das somas guardadas de cada grupo
+        somas = pd.DataFrame(self._somas_ewm(novas, grupos), columns=valores, index=novas.index)
+
+        resultado = novas[[*self.chave, *ORDEM]].copy()
+        for metrica in METRICAS:
+            num, den = f"{metrica}_num", f"{metrica}_den"
+            resultado[f"{metrica}_movel"] = janela[num] / janela[den].where(janela[den] > 0)
+            resultado[f"{metrica}_ewm"] = somas[num] / somas[den].where(somas[den] > 0)
+
+        forma = Forma(self.chave, self.janela, self.alfa)
+        forma.linhas = self.linhas + len(novas)
+        forma.impressao = (self.impressao + self._impressao(novas)) % 2**64
+        forma.tabela = resultado if self.linhas == 0 else pd.concat([self.tabela, resultado], ignore_index=True)
+        forma._cauda = juntas.groupby(self.chave, sort=False).tail(self.janela).reset_index(drop=True)
+        ultimas = novas.groupby(self.chave, sort=False).tail(1).index
+        estado = somas.loc[ultimas].set_axis(grupos[ultimas])
+        forma._ewm = pd.concat([self._ewm.drop(estado.index, errors="ignore"), estado])
+        posicao = _posicao(novas.loc[ultimas]).set_axis(grupos[ultimas])
+        forma._ultima = pd.concat([self._ultima.drop(posicao.index, errors="ignore"), posicao])
+        return forma
+
+    def serie(self, **filtros):
+        """Linhas da tabela do grupo pedido (ex.: player_name="..."), na ordem das partidas."""
+        linhas = self.tabela
+        for coluna, valor in filtros.items():
+            linhas = linhas[linhas[coluna] == valor]
+        return linhas.sort_values(ORDEM)
+
+
+class Tendencias:
+    """Forma por jogador e por clube da mesma base, atualizáveis juntas."""
+
+    def __init__(self, janela=JANELA_PADRAO, alfa=ALFA_PADRAO):
+        self.jogadores = Forma(["time_alvo", "player_name"], janela, alfa)
+        self.clube = Forma(["time_alvo"], janela, alfa)
+
+    def atualizar(self, partidas):
+        """Nova Tendencias com as partidas de `partidas` (a base inteira) que ainda não foram calculadas."""
+        tendencias = Tendencias(self.jogadores.janela, self.jogadores.alfa)
+        tendencias.jogadores = self.jogadores.anexar(self.jogadores.novas(partidas))
+        clube = por_clube(partidas)
+        tendencias.clube = self.clube.anexar(self.clube.novas(clube))
+        return tendencias
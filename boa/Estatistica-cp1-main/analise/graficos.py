@@ -0,0 +1,97 @@
+import io
+import threading
+from collections import OrderedDict
+
+from analise.metricas import medir
+
+# Orçamento padrão do cache de gráficos renderizados
+LIMITE_BYTES_PADRAO = 64 * 1024 * 1024
+
+
+class CacheGraficos:
+    """Cache LRU de imagens já renderizadas (bytes), limitado por um orçamento total de bytes."""
+
+    def __init__(self, limite_bytes=LIMITE_BYTES_PADRAO):
+        self.limite_bytes = limite_bytes
+        self._itens = OrderedDict()
+        self._bytes = 0
+        self._trava = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def obter(self, chave):
+        with self._trava:
+            dados = self._itens.get(chave)
+            if dados is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._itens.move_to_end(chave)
+            return dados
+
+    def guardar(self, chave, dados):
+        with self._trava:
+            if chave in self._itens:
+                self._bytes -= len(self._itens.pop(chave))
+            # Uma imagem maior que o orçamento inteiro não é guardada
+            if len(dados) > self.limite_bytes:
+                return
+            self._itens[chave] = dados
+            self._bytes += len(dados)
+            # Remove os menos usados recentemente até caber no orçamento
+            while self._bytes > self.limite_bytes:
+                _, removido = self._itens.popitem(last=False)
+                self._bytes -= len(removido)
+
+    def descartar(self, predicado):
+        """Remove as imagens cuja chave satisfaz `predicado` (ex.: as de uma versão antiga dos dados)."""
+        with self._trava:
+            for chave in [c for c in self._itens if predicado(c)]:
+                self._bytes -= len(self._itens.pop(chave))
+
+    def limpar(self):
+        with self._trava:
+            self._itens.clear()
+            self._bytes = 0
+
+    def tamanho(self):
+        with self._trava:
+            return {
+                "itens": len(self._itens),
+                "bytes": self._bytes,
+                "limite_bytes": self.limite_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Cache único do processo, compartilhado por todas as sessões
+cache_graficos = CacheGraficos()
+
+
+def renderizar(chave, desenhar, formato="png"):
+    """Devolve os bytes do gráfico `chave`, chamando `desenhar()` só quando ele não está no cache.
+
+    `desenhar` deve criar e devolver uma figura do matplotlib; ela é sempre fechada depois de
+    salva, para que a memória do processo não cresça a cada rerun. A chave deve incluir a
+    pergunta, os filtros e a versão dos dados.
+    """
+    chave = (formato, *chave)
+    dados = cache_graficos.obter(chave)
+    if dados is not None:
+        return dados
+
+    import matplotlib.pyplot as plt
+
+    with medir("grafico.desenho"):
+        fig = desenhar()
+    try:
+        buffer = io.BytesIO()
+        with medir("grafico.rasterizacao"):
+            fig.savefig(buffer, format=formato, dpi=200, bbox_inches="tight")
+    finally:
+        plt.close(fig)
+
+    dados = buffer.getvalue()
+    cache_graficos.guardar(chave, dados)
+    return dados
@@ -0,0 +1,54 @@
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+# Colunas usadas como filtro nas páginas (adversario é derivada; ver analise.cubo.com_adversario)
+COLUNAS_INDEXADAS = ["player_position", "home_or_away", "ano", "tournament", "adversario"]
+
+
+def _indexar_coluna(serie):
+    # Agrupa as posições das linhas por valor com uma ordenação estável (sem máscara por valor)
+    codigos, valores = pd.factorize(serie)
+    ordem = np.argsort(codigos, kind="stable")
+    contagens = np.bincount(codigos[codigos >= 0], minlength=len(valores))
+    # Linhas sem valor (código -1) ficam no começo da ordenação e são descartadas
+    ordem = ordem[np.count_nonzero(codigos < 0):]
+    partes = np.split(ordem, np.cumsum(contagens)[:-1]) if len(valores) else []
+
+    indice = {}
+    for valor, linhas in zip(valores, partes):
+        linhas.flags.writeable = False
+        indice[valor] = linhas
+    return indice
+
+
+def construir_indices(df, colunas=COLUNAS_INDEXADAS):
+    """Para cada coluna, mapeia cada valor às posições (iloc) das linhas que o contêm."""
+    return {coluna: _indexar_coluna(df[coluna]) for coluna in colunas if coluna in df.columns}
+
+
+def posicoes(indices, **filtros):
+    """Posições das linhas que atendem a todos os filtros (valor único ou lista de valores por coluna).
+
+    Devolve None quando não há filtro, ou seja, todas as linhas.
+    """
+    conjuntos = []
+    for coluna, valor in filtros.items():
+        if valor is None:
+            continue
+        valores = valor if isinstance(valor, (list, tuple, set)) else [valor]
+        vazio = np.empty(0, dtype=np.intp)
+        partes = [indices[coluna].get(v, vazio) for v in valores]
+        conjuntos.append(partes[0] if len(partes) == 1 else np.sort(np.concatenate(partes)))
+
+    if not conjuntos:
+        return None
+    # Interseção começando pelo menor conjunto: custo proporcional às linhas que casam
+    conjuntos.sort(key=len)
+    return reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), conjuntos)
+
+
+def filtrar_linhas(df, indices, **filtros):
+    linhas = posicoes(indices, **filtros)
+    return df if linhas is None else df.iloc[linhas]
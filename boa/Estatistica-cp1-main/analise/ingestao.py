@@ -0,0 +1,137 @@
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+from analise.agregados import atualizar_agregados, construir_agregados
+from analise.dados import carregar_agregados, fonte_padrao, registrar_anexo, salvar_agregados
+from analise.esquema import aplicar_esquema, relatorio_memoria
+from analise.mapeado import gravar_mapeado, ler_mapeado
+from analise.particoes import gravar_particoes, ler_particoes
+
+# Uma linha da base = um jogador em uma partida (de um clube-alvo; os jogos são numerados por clube)
+CHAVE = ["time_alvo", "ano", "jogo", "player_name"]
+
+
+def destino_padrao(origem):
+    # arquivo.csv.gz -> arquivo.parquet / dados.csv -> dados.parquet
+    origem = Path(origem)
+    nome = origem.name
+    for sufixo in (".gz", ".csv"):
+        if nome.endswith(sufixo):
+            nome = nome[: -len(sufixo)]
+    return origem.with_name(nome + ".parquet")
+
+
+def ler_bruto(origem, colunas=None):
+    # A compressão (.gz) é detectada pela extensão
+    return pd.read_csv(origem, usecols=colunas)
+
+
+def _ler_base(base, colunas=None):
+    if base.is_dir():
+        return ler_particoes(base, colunas)
+    if base.suffix == ".arrow":
+        return ler_mapeado(base, colunas)
+    if base.suffix == ".parquet":
+        return pd.read_parquet(base, columns=colunas)
+    return pd.read_csv(base, usecols=colunas)
+
+
+def _gravar_parquet(tipado, destino):
+    # Colunas de texto fora do esquema também viram categorias.
+    # As categorias são gravadas no Parquet com codificação por dicionário.
+    texto = tipado.select_dtypes(include=["object", "string"]).columns
+    tipado[texto] = tipado[texto].astype("category")
+    tipado.to_parquet(destino, index=False, compression="zstd")
+
+
+def _gravar(tipado, destino):
+    # .arrow: Arrow IPC sem compressão, para ser mapeado pelos processos do app (ver analise.mapeado)
+    if Path(destino).suffix == ".arrow":
+        texto = tipado.select_dtypes(include=["object", "string"]).columns
+        tipado[texto] = tipado[texto].astype("category")
+        gravar_mapeado(tipado, destino)
+    else:
+        _gravar_parquet(tipado, destino)
+
+
+def converter(origem, destino=None, colunas=None):
+    """Converte o CSV (ou CSV.gz) bruto em Parquet (ou Arrow IPC, se `destino` terminar em .arrow) tipado.
+
+    Devolve o caminho gerado e o relatório de memória.
+    """
+    destino = Path(destino or destino_padrao(origem))
+    df = ler_bruto(origem, colunas)
+
+    tipado = aplicar_esquema(df)
+    _gravar(tipado, destino)
+
+    # A tabela agregada é gravada junto para que o app não precise montá-la na primeira leitura
+    if "player_name" in tipado.columns:
+        salvar_agregados(destino, construir_agregados(tipado))
+    return destino, relatorio_memoria(df, tipado)
+
+
+def remover_repetidos(novos, existentes):
+    # Descarta linhas repetidas no próprio lote e as que já estão na base
+    novos = novos.drop_duplicates(subset=CHAVE)
+    ja_ingeridas = pd.MultiIndex.from_frame(existentes[CHAVE].astype(object))
+    chaves_novas = pd.MultiIndex.from_frame(novos[CHAVE].astype(object))
+    return novos[~chaves_novas.isin(ja_ingeridas)]
+
+
+def anexar(origem_novos, base=None):
+    """Acrescenta à base só as linhas de partidas novas e atualiza a tabela agregada de forma incremental.
+
+    Devolve o número de linhas efetivamente acrescentadas.
+    """
+    base = Path(base or fonte_padrao()).resolve()
+    novos = aplicar_esquema(ler_bruto(origem_novos))
+
+    # Para deduplicar basta ler as colunas da chave da base
+    novos = remover_repetidos(novos, _ler_base(base, CHAVE))
+    if novos.empty:
+        return 0
+
+    # Tabela agregada atual (lida antes de a base mudar, enquanto ainda está em dia)
+    agregados = carregar_agregados(base)
+
+    if base.is_dir():
+        # Base particionada: as linhas novas viram arquivos novos nas partições delas
+        gravar_particoes(novos, base)
+    elif base.suffix in (".parquet", ".arrow"):
+        # Parquet e Arrow IPC não aceitam anexar: a base é regravada com as linhas novas no fim
+        completo = pd.concat([_ler_base(base), novos], ignore_index=True)
+        _gravar(aplicar_esquema(completo), base)
+    else:
+        colunas = pd.read_csv(base, nrows=0).columns
+        novos[colunas].to_csv(base, mode="a", header=False, index=False, na_rep="NA")
+
+    # Só as linhas novas são agregadas e somadas à tabela existente
+    agregados = atualizar_agregados(agregados, novos)
+    salvar_agregados(base, agregados)
+    registrar_anexo(base, agregados)
+    return len(novos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Converte a base CSV em Parquet (ou Arrow IPC) colunar ou anexa partidas novas.")
+    parser.add_argument("origem", help="arquivo .csv ou .csv.gz de entrada")
+    parser.add_argument("-o", "--destino", help="arquivo .parquet ou .arrow de saída (com --anexar, a base que recebe as linhas)")
+    parser.add_argument("-c", "--colunas", nargs="+", help="mantém apenas estas colunas")
+    parser.add_argument("-a", "--anexar", action="store_true", help="anexa só as partidas novas à base existente")
+    args = parser.parse_args(argv)
+
+    if args.anexar:
+        total = anexar(args.origem, args.destino)
+        print(f"{total} linhas novas anexadas")
+        return
+
+    destino, memoria = converter(args.origem, args.destino, args.colunas)
+    print(f"Conversão concluída: {destino}")
+    print(f"Memória: {memoria['antes'] / 1e6:.2f} MB -> {memoria['depois'] / 1e6:.2f} MB ({memoria['reducao']:.1f}x menor)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Calcula todas as perguntas, para a base inteira e para cada clube-alvo, e grava os resultados.
+
+    <arquivo da base>.resultados/   (ex.: dados-completos-Ituano.csv.resultados/)
+        manifesto.json              versão da base, clubes e perguntas calculadas
+        Todos/casa_fora.json        pergunta 1 (números)
+        Todos/xg_vs_gols.parquet    demais perguntas (tabelas por jogador)
+        <clube>/...
+
+A base é lida uma única vez (em blocos) para montar as tabelas agregadas de todos
+os clubes; cada par (clube, pergunta) é calculado em paralelo. O manifesto é
+gravado por último, então o app só serve resultados completos e da versão atual.
+
+Uso: python -m analise.lote [origem] [-o pasta] [-p PROCESSOS]
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import quote
+
+import pandas as pd
+
+from analise.agregados import DIMENSOES, acumular, finalizar
+from analise.blocos import acumular_em_blocos
+from analise.dados import fonte_padrao, pasta_resultados, versao_dos_dados
+from analise.esquema import aplicar_esquema
+from analise.particoes import ler_particoes
+from analise.perguntas import PERGUNTAS
+
+# Nome do "clube" que reúne a base inteira
+TODOS = "Todos"
+MANIFESTO = "manifesto.json"
+
+
+def tabelas_por_clube(origem):
+    """Tabela agregada da base inteira (TODOS) e de cada time_alvo, numa única leitura da base."""
+    dimensoes = ["time_alvo", *DIMENSOES]
+    if Path(origem).is_dir():
+        necessarias = lambda coluna: coluna in dimensoes or coluna.startswith("statistics_")
+        # Só as dimensões e as statistics_* são lidas das partições
+        acumulado = acumular(aplicar_esquema(ler_particoes(origem, necessarias)), dimensoes)
+    else:
+        acumulado = acumular_em_blocos(origem, dimensoes)
+
+    # As somas em ponto fixo são juntadas antes de finalizar: TODOS sai idêntico à agregação direta
+    tabelas = {TODOS: finalizar(acumulado.groupby(level=DIMENSOES, observed=True, dropna=False).sum())}
+    for clube, tabela in acumulado.groupby(level="time_alvo", observed=True):
+        tabelas[clube] = finalizar(tabela.droplevel("time_alvo"))
+    return tabelas
+
+
+def _pasta_do_clube(pasta, clube):
+    return Path(pasta) / quote(str(clube), safe="")
+
+
+def _calcular(tabela, nome):
+    return PERGUNTAS[nome](tabela)
+
+
+def _gravar(pasta, clube, nome, resultado):
+    destino = _pasta_do_clube(pasta, clube)
+    destino.mkdir(parents=True, exist_ok=True)
+    if isinstance(resultado, pd.DataFrame):
+        resultado.to_parquet(destino / f"{nome}.parquet")
+    else:
+        (destino / f"{nome}.json").write_text(json.dumps(resultado, indent=2), encoding="utf-8")
+
+
+def ler_resultado(pasta, clube, nome, versao):
+    """Resultado gravado de `nome` para `clube`, ou None se não houver ou se for de outra versão da base."""
+    pasta = Path(pasta)
+    manifesto = pasta / MANIFESTO
+    if not manifesto.exists() or json.loads(manifesto.read_text(encoding="utf-8"))["versao"] != list(versao):
+        return None
+    destino = _pasta_do_clube(pasta, clube)
+    if (destino / f"{nome}.parquet").exists():
+        return pd.read_parquet(destino / f"{nome}.parquet")
+    if (destino / f"{nome}.json").exists():
+        return json.loads((destino / f"{nome}.json").read_text(encoding="utf-8"))
+    return None
+
+
+def executar(origem=None, destino=None, processos=None):
+    """Calcula todas as perguntas para TODOS e cada clube em paralelo; devolve o manifesto gravado."""
+    origem = Path(origem or fonte_padrao()).resolve()
+    destino = Path(destino or pasta_resultados(origem))
+    versao = versao_dos_dados(origem)
+
+    tabelas = tabelas_por_clube(origem)
+    # Um manifesto antigo deixa de valer assim que os arquivos começam a ser substituídos
+    (destino / MANIFESTO).unlink(missing_ok=True)
+    with ProcessPoolExecutor(max_workers=processos or os.cpu_count() or 1) as pool:
+        futuros = {
+            (clube, nome): pool.submit(_calcular, tabela, nome) for clube, tabela in tabelas.items() for nome in PERGUNTAS
+        }
+        for (clube, nome), futuro in futuros.items():
+            _gravar(destino, clube, nome, futuro.result())
+
+    manifesto = {"versao": list(versao), "clubes": list(tabelas), "perguntas": list(PERGUNTAS)}
+    (destino / MANIFESTO).write_text(json.dumps(manifesto, indent=2, ensure_ascii=False), encoding="utf-8")
+    return manifesto
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pré-calcula todas as perguntas para a base e para cada clube.")
+    parser.add_argument("origem", nargs="?", help="base (.csv, .csv.gz, .parquet ou pasta particionada)")
+    parser.add_argument("-o", "--destino", help="pasta de saída (padrão: <arquivo da base>.resultados)")
+    parser.add_argument("-p", "--processos", type=int, help="processos em paralelo (padrão: número de CPUs)")
+    args = parser.parse_args(argv)
+
+    manifesto = executar(args.origem, args.destino, args.processos)
+    print(f"{len(manifesto['perguntas'])} perguntas x {len(manifesto['clubes'])} recortes gravados")
+
+
+if __name__ == "__main__":
+    main()
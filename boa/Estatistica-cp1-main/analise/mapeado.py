@@ -0,0 +1,52 @@
+"""Base em Arrow IPC, mapeada na memória (somente leitura) por todos os processos do app.
+
+    python -m analise.ingestao dados-completos-Ituano.csv -o dados-completos-Ituano.arrow
+
+O arquivo é gravado sem compressão e já no tipo compacto, então as colunas
+numéricas viram colunas do pandas que apontam direto para as páginas mapeadas
+(dtype `int16[pyarrow]`, `float[pyarrow]`...). Vários processos do Streamlit
+compartilham essas páginas pelo cache do sistema operacional, em vez de cada um
+guardar a própria cópia; só os códigos das colunas categóricas são copiados.
+
+O arquivo nunca é alterado no lugar: uma nova versão é gravada ao lado e
+renomeada por cima, e os processos que ainda mapeiam a antiga continuam lendo-a.
+"""
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from analise.blocos import LINHAS_POR_BLOCO
+
+
+def _tipo_pandas(tipo):
+    # Dicionários viram Categorical (cópia só dos códigos); os demais ficam nos buffers mapeados
+    return None if pa.types.is_dictionary(tipo) else pd.ArrowDtype(tipo)
+
+
+def para_pandas(tabela):
+    return tabela.to_pandas(types_mapper=_tipo_pandas)
+
+
+def abrir(caminho):
+    """Tabela Arrow cujos buffers apontam para o arquivo mapeado (as páginas só são lidas quando usadas)."""
+    return pa.ipc.open_file(pa.memory_map(str(caminho), "r")).read_all()
+
+
+def ler_mapeado(caminho, colunas=None):
+    tabela = abrir(caminho)
+    if colunas:
+        tabela = tabela.select(colunas)
+    return para_pandas(tabela)
+
+
+def gravar_mapeado(tipado, destino, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """Grava o DataFrame tipado em Arrow IPC sem compressão, substituindo `destino` de uma vez."""
+    destino = Path(destino)
+    tabela = pa.Table.from_pandas(tipado, preserve_index=False)
+    temporario = destino.with_name(destino.name + ".tmp")
+    with pa.OSFile(str(temporario), "wb") as arquivo, pa.ipc.new_file(arquivo, tabela.schema) as escritor:
+        escritor.write_table(tabela, max_chunksize=linhas_por_bloco)
+    # Renomear não mexe nas páginas já mapeadas pelos outros processos
+    temporario.replace(destino)
+    return destino
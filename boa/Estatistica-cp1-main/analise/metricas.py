@@ -0,0 +1,203 @@
+"""Tempo de cada etapa das páginas (carga, filtros, cálculos, gráficos), com histogramas por etapa.
+
+    with medir("ic.calculo"):
+        ...
+
+As medições ficam no processo, compartilhadas por todas as sessões. O painel
+lateral (painel_lateral) mostra p50/p95 por etapa e só aparece com `?perfil=1`
+na URL. As métricas saem em texto no formato do Prometheus (prometheus()), em
+JSON (exportar) ou por HTTP em /metrics, quando METRICAS_PORTA está definida.
+"""
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Limites superiores (em segundos) dos baldes do histograma; o último balde é +Inf
+LIMITES_S = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+# Medições recentes guardadas por etapa para p50/p95 exatos
+AMOSTRAS_POR_ETAPA = 1000
+NOME_METRICA = "estatistica_etapa_segundos"
+
+
+class Metricas:
+    """Histograma (contagem por balde, soma e total) e medições recentes de cada etapa."""
+
+    def __init__(self, limites=LIMITES_S, amostras=AMOSTRAS_POR_ETAPA):
+        self.limites = list(limites)
+        self.amostras = amostras
+        self._etapas = {}
+        self._trava = threading.Lock()
+
+    def registrar(self, etapa, segundos):
+        with self._trava:
+            dados = self._etapas.get(etapa)
+            if dados is None:
+                dados = self._etapas[etapa] = {
+                    "baldes": [0] * (len(self.limites) + 1),
+                    "soma": 0.0,
+                    "n": 0,
+                    "recentes": deque(maxlen=self.amostras),
+                }
+            dados["baldes"][bisect.bisect_left(self.limites, segundos)] += 1
+            dados["soma"] += segundos
+            dados["n"] += 1
+            dados["recentes"].append(segundos)
+
+    @contextmanager
+    def medir(self, etapa):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(etapa, time.perf_counter() - inicio)
+
+    def _copiar(self):
+        with self._trava:
+            return {
+                etapa: {**dados, "baldes": list(dados["baldes"]), "recentes": list(dados["recentes"])}
+                for etapa, dados in sorted(self._etapas.items())
+            }
+
+    def percentis(self):
+        """Uma linha por etapa: execuções, p50, p95 e máximo (ms, nas medições recentes) e tempo total (s)."""
+        linhas = []
+        for etapa, dados in self._copiar().items():
+            p50, p95 = np.percentile(dados["recentes"], [50, 95]) * 1000
+            linhas.append({
+                "etapa": etapa,
+                "n": dados["n"],
+                "p50_ms": p50,
+                "p95_ms": p95,
+                "max_ms": max(dados["recentes"]) * 1000,
+                "total_s": dados["soma"],
+            })
+        return pd.DataFrame(linhas, columns=["etapa", "n", "p50_ms", "p95_ms", "max_ms", "total_s"]).set_index("etapa")
+
+    def prometheus(self):
+        """Histogramas no formato de texto do Prometheus (baldes acumulados, _sum e _count)."""
+        linhas = [
+            f"# HELP {NOME_METRICA} Tempo de cada etapa das páginas do dashboard.",
+            f"# TYPE {NOME_METRICA} histogram",
+        ]
+        for etapa, dados in self._copiar().items():
+            rotulo = etapa.replace("\\", "\\\\").replace('"', '\\"')
+            acumulado = 0
+            for limite, contagem in zip([*self.limites, "+Inf"], dados["baldes"]):
+                acumulado += contagem
+                linhas.append(f'{NOME_METRICA}_bucket{{etapa="{rotulo}",le="{limite}"}} {acumulado}')
+            linhas.append(f'{NOME_METRICA}_sum{{etapa="{rotulo}"}} {dados["soma"]}')
+            linhas.append(f'{NOME_METRICA}_count{{etapa="{rotulo}"}} {dados["n"]}')
+        return "\n".join(linhas) + "\n"
+
+    def como_dict(self):
+        percentis = self.percentis()
+        return {
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "limites_s": self.limites,
+            "etapas": {
+                etapa: {"baldes": dados["baldes"], "soma_s": dados["soma"], **percentis.loc[etapa].to_dict()}
+                for etapa, dados in self._copiar().items()
+            },
+        }
+
+    def exportar(self, destino):
+        """Grava as métricas em `destino`: texto do Prometheus se terminar em .prom, JSON caso contrário."""
+        destino = Path(destino)
+        if destino.suffix == ".prom":
+            destino.write_text(self.prometheus(), encoding="utf-8")
+        else:
+            destino.write_text(json.dumps(self.como_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
+        return destino
+
+    def limpar(self):
+        with self._trava:
+            self._etapas.clear()
+
+
+# Métricas únicas do processo, compartilhadas por todas as sessões
+metricas = Metricas()
+medir = metricas.medir
+
+_servidor = None
+# Porta(s) ocupada(s): o processo desiste do endpoint em vez de tentar de novo a cada rerun
+_endpoint_falhou = False
+_trava_servidor = threading.Lock()
+_log = logging.getLogger(__name__)
+
+
+class _Endpoint(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] == "/metrics":
+            corpo, tipo = metricas.prometheus().encode(), "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path.split("?")[0] == "/metrics.json":
+            corpo, tipo = json.dumps(metricas.como_dict(), ensure_ascii=False).encode(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+def _portas(valor):
+    # "9477" ou uma faixa "9477-9480", uma porta para cada processo do app
+    inicio, _, fim = str(valor).partition("-")
+    return range(int(inicio), int(fim or inicio) + 1)
+
+
+def iniciar_endpoint(porta=None):
+    """Serve /metrics (Prometheus) e /metrics.json em 127.0.0.1:`porta` (padrão: METRICAS_PORTA; sem ela, não faz nada).
+
+    Com uma faixa ("9477-9480"), cada processo fica com a primeira porta livre dela. Se nenhuma
+    estiver livre, o aviso sai uma vez no log e o app segue sem o endpoint.
+    """
+    global _servidor, _endpoint_falhou
+    porta = porta or os.environ.get("METRICAS_PORTA")
+    if not porta:
+        return None
+    with _trava_servidor:
+        if _servidor is None and not _endpoint_falhou:
+            for numero in _portas(porta):
+                try:
+                    _servidor = ThreadingHTTPServer(("127.0.0.1", numero), _Endpoint)
+                except OSError:
+                    continue
+                threading.Thread(target=_servidor.serve_forever, name="metricas-http", daemon=True).start()
+                break
+            else:
+                _endpoint_falhou = True
+                _log.warning("endpoint de métricas desligado: nenhuma porta livre em %s", porta)
+    return _servidor
+
+
+def painel_lateral():
+    """Painel de perfil na barra lateral (p50/p95 por etapa), visível só com `?perfil=1` na URL."""
+    import streamlit as st
+
+    if st.query_params.get("perfil") != "1":
+        return
+    with st.sidebar.expander("⏱️ Perfil das etapas", expanded=True):
+        tabela = metricas.percentis()
+        if tabela.empty:
+            st.caption("Nenhuma etapa medida ainda.")
+            return
+        st.dataframe(tabela.round(1))
+        st.download_button("Prometheus", metricas.prometheus(), "metricas.prom", "text/plain")
+        st.download_button(
+            "JSON", json.dumps(metricas.como_dict(), indent=2, ensure_ascii=False), "metricas.json", "application/json"
+        )
@@ -0,0 +1,112 @@
+"""Base particionada por clube-alvo e temporada (Parquet, layout hive).
+
+    pasta/time_alvo=Ituano/ano=2024/parte-00000.parquet
+
+Cada recorte (um clube, ou um clube numa temporada) é uma subpasta, então ler
+um recorte só abre os arquivos dele, não importa quantos clubes haja na base.
+
+Uso: python -m analise.particoes origem.{csv,csv.gz,parquet} pasta [--bloco LINHAS] [--substituir]
+"""
+import argparse
+import shutil
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+from analise.blocos import LINHAS_POR_BLOCO, ler_em_blocos
+from analise.esquema import aplicar_esquema
+
+PARTICOES = ["time_alvo", "ano"]
+PADRAO_ARQUIVOS = "parte-*.parquet"
+
+
+def _segmento(coluna, valor):
+    return f"{coluna}={quote(str(valor), safe='')}"
+
+
+def caminho_da_particao(pasta, time_alvo=None, ano=None):
+    """Subpasta do recorte: a base inteira, um clube, ou um clube numa temporada."""
+    caminho = Path(pasta)
+    if time_alvo is None:
+        return caminho
+    caminho = caminho / _segmento("time_alvo", time_alvo)
+    return caminho if ano is None else caminho / _segmento("ano", ano)
+
+
+def pasta_raiz(caminho):
+    # Sobe das subpastas "coluna=valor" até a raiz da base
+    caminho = Path(caminho)
+    while "=" in caminho.name:
+        caminho = caminho.parent
+    return caminho
+
+
+def arquivos(caminho):
+    return sorted(Path(caminho).rglob(PADRAO_ARQUIVOS))
+
+
+def valores(pasta, time_alvo=None):
+    """Clubes da base ou, com `time_alvo`, as temporadas desse clube (só lista as pastas, sem ler dados)."""
+    caminho = caminho_da_particao(pasta, time_alvo)
+    nomes = [unquote(p.name.split("=", 1)[1]) for p in caminho.iterdir() if p.is_dir() and "=" in p.name]
+    return sorted(int(n) for n in nomes) if time_alvo is not None else sorted(nomes)
+
+
+def gravar_particoes(df, pasta):
+    """Grava `df` na base, um arquivo novo por partição tocada. Devolve o número de linhas gravadas."""
+    tipado = aplicar_esquema(df)
+    # Texto simples (com nulos) para que todos os arquivos tenham o mesmo esquema
+    categorias = tipado.select_dtypes("category").columns
+    tipado[categorias] = tipado[categorias].astype("string")
+
+    for (time_alvo, ano), grupo in tipado.groupby(PARTICOES, observed=True, sort=False):
+        destino = caminho_da_particao(pasta, time_alvo, ano)
+        destino.mkdir(parents=True, exist_ok=True)
+        numero = len(list(destino.glob(PADRAO_ARQUIVOS)))
+        grupo.drop(columns=PARTICOES).to_parquet(destino / f"parte-{numero:05d}.parquet", index=False, compression="zstd")
+    return len(tipado)
+
+
+def particionar(origem, pasta, linhas_por_bloco=LINHAS_POR_BLOCO, substituir=False):
+    """Reparte a base `origem` em `pasta`, bloco a bloco (a origem nunca é lida inteira)."""
+    pasta = Path(pasta)
+    if arquivos(pasta):
+        if not substituir:
+            raise FileExistsError(f"{pasta} já contém uma base particionada (use substituir=True)")
+        shutil.rmtree(pasta)
+    return sum(gravar_particoes(bloco, pasta) for bloco in ler_em_blocos(origem, linhas_por_bloco))
+
+
+def ler_particoes(caminho, colunas=None):
+    """Lê a base particionada (ou só a subpasta de um recorte), repondo time_alvo e ano como colunas.
+
+    `colunas` pode ser uma lista ou uma função nome -> bool (como em analise.blocos.ler_em_blocos).
+    """
+    import pyarrow.dataset as ds
+
+    partes = arquivos(caminho)
+    if not partes:
+        raise FileNotFoundError(f"nenhum arquivo {PADRAO_ARQUIVOS} em {caminho}")
+    dataset = ds.dataset(
+        [str(p) for p in partes], format="parquet", partitioning="hive", partition_base_dir=str(pasta_raiz(caminho))
+    )
+    if callable(colunas):
+        colunas = [c for c in dataset.schema.names if colunas(c.strip())]
+    df = dataset.to_table(columns=colunas).to_pandas()
+    # Mesma ordem da base original: time_alvo e ano vêm primeiro
+    return df[[c for c in PARTICOES if c in df.columns] + [c for c in df.columns if c not in PARTICOES]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reparte a base em pastas por clube-alvo e temporada.")
+    parser.add_argument("origem", help="arquivo .csv, .csv.gz ou .parquet")
+    parser.add_argument("pasta", help="pasta de destino")
+    parser.add_argument("--bloco", type=int, default=LINHAS_POR_BLOCO, help="linhas lidas por vez")
+    parser.add_argument("--substituir", action="store_true", help="apaga uma base particionada já existente na pasta")
+    args = parser.parse_args(argv)
+
+    linhas = particionar(args.origem, args.pasta, args.bloco, args.substituir)
+    print(f"{linhas} linhas gravadas em {args.pasta}")
+
+
+if __name__ == "__main__":
+    main()
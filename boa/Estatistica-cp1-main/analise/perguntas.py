@@ -0,0 +1,95 @@
+"""As sete perguntas do dashboard como funções puras sobre a tabela agregada (ver analise.agregados).
+
+Cada função recebe a tabela jogador x mando x ano e devolve um DataFrame (ou, na
+pergunta 1, um dicionário de números), sem Streamlit e sem gráficos.
+"""
+from analise.agregados import por_jogador
+
+
+def casa_fora(tabela, coluna="statistics_rating"):
+    """Pergunta 1: médias ponderadas pelos minutos, IC 95% e teste t de Welch, em casa vs fora."""
+    # scipy só é carregado por esta pergunta
+    from analise.estatisticas import intervalo_confianca, media_ponderada, momentos_do_recorte, teste_t
+
+    home = momentos_do_recorte(tabela, coluna, home_or_away="home")
+    away = momentos_do_recorte(tabela, coluna, home_or_away="away")
+    media_home, ic_inf_home, ic_sup_home = intervalo_confianca(home)
+    media_away, ic_inf_away, ic_sup_away = intervalo_confianca(away)
+    t_stat, p_value = teste_t(home, away)
+    resultado = {
+        "media_ponderada_home": media_ponderada(home),
+        "media_ponderada_away": media_ponderada(away),
+        "media_home": media_home,
+        "ic_inf_home": ic_inf_home,
+        "ic_sup_home": ic_sup_home,
+        "media_away": media_away,
+        "ic_inf_away": ic_inf_away,
+        "ic_sup_away": ic_sup_away,
+        "t_stat": t_stat,
+        "p_value": p_value,
+    }
+    return {chave: float(valor) for chave, valor in resultado.items()}
+
+
+def xg_vs_gols(tabela):
+    """Pergunta 2: xG e gols totais por jogador."""
+    return por_jogador(tabela)["soma"][["statistics_expected_goals", "statistics_goals"]].dropna()
+
+
+def contribuicao_por_minuto(tabela, top=10):
+    """Pergunta 3: os `top` jogadores com mais gols + assistências por minuto jogado."""
+    soma = por_jogador(tabela)["soma"][["statistics_goals", "statistics_goal_assist", "statistics_minutes_played"]]
+    soma = soma[soma["statistics_minutes_played"] > 0]
+    soma = soma.assign(
+        contribuicao_por_minuto=(soma["statistics_goals"] + soma["statistics_goal_assist"]) / soma["statistics_minutes_played"]
+    )
+    return soma.sort_values(by="contribuicao_por_minuto", ascending=False).head(top)
+
+
+def nota_vs_participacoes(tabela):
+    """Pergunta 4: nota média e participações ofensivas (gols + assistências) por jogador."""
+    jogadores = por_jogador(tabela)
+    medias = jogadores["media"][["statistics_rating", "statistics_goals", "statistics_goal_assist"]]
+    medias = medias.assign(
+        participacoes_ofensivas=jogadores["soma"][["statistics_goals", "statistics_goal_assist"]].sum(axis=1)
+    )
+    return medias.dropna(subset=["statistics_rating", "participacoes_ofensivas"])
+
+
+def xg_alto_gols_baixos(tabela, top=10):
+    """Pergunta 5: jogadores com xG acima da média e gols abaixo da média, pelos que mais "devem" gols."""
+    soma = por_jogador(tabela)["soma"][["statistics_expected_goals", "statistics_goals"]]
+    soma = soma.assign(diferenca=soma["statistics_expected_goals"] - soma["statistics_goals"])
+    filtrado = soma[
+        (soma["statistics_expected_goals"] > soma["statistics_expected_goals"].mean())
+        & (soma["statistics_goals"] < soma["statistics_goals"].mean())
+    ]
+    return filtrado.sort_values(by="diferenca", ascending=False).head(top)
+
+
+def passes_vs_nota(tabela):
+    """Pergunta 6: média de passes certos e nota média por jogador."""
+    return por_jogador(tabela)["media"][["statistics_accurate_pass", "statistics_rating"]].dropna()
+
+
+def eficiencia_pouco_tempo(tabela, menos_minutos=20, top=10):
+    """Pergunta 7: entre os `menos_minutos` jogadores com menos tempo em campo, os `top` mais eficientes."""
+    soma = por_jogador(tabela)["soma"][["statistics_minutes_played", "statistics_goals", "statistics_goal_assist"]]
+    soma = soma[soma["statistics_minutes_played"] > 0]
+    soma = soma.assign(
+        eficiencia=(soma["statistics_goals"] + soma["statistics_goal_assist"]) / soma["statistics_minutes_played"]
+    )
+    menos_tempo = soma.sort_values(by="statistics_minutes_played").head(menos_minutos)
+    return menos_tempo.sort_values(by="eficiencia", ascending=False).head(top)
+
+
+# Nome de cada pergunta (usado nos arquivos do lote) -> função, na ordem do menu
+PERGUNTAS = {
+    "casa_fora": casa_fora,
+    "xg_vs_gols": xg_vs_gols,
+    "contribuicao_por_minuto": contribuicao_por_minuto,
+    "nota_vs_participacoes": nota_vs_participacoes,
+    "xg_alto_gols_baixos": xg_alto_gols_baixos,
+    "passes_vs_nota": passes_vs_nota,
+    "eficiencia_pouco_tempo": eficiencia_pouco_tempo,
+}
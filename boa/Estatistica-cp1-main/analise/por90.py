@@ -0,0 +1,56 @@
+"""Estatísticas por 90 minutos de cada jogador, para todas as statistics_* de uma vez.
+
+Parte da tabela agregada por clube x jogador: a matriz jogadores x estatísticas
+(somas) é multiplicada pelo vetor 90 / minutos de cada jogador numa única
+operação. A nota (uma média, não uma contagem) e os próprios minutos ficam de fora.
+Um jogador que passou por dois clubes tem uma linha em cada um.
+
+Com poucos minutos as taxas são instáveis (um gol em 10 minutos vira 9 por 90), então
+os rankings deixam de fora quem jogou menos que `minutos_minimos`.
+"""
+import numpy as np
+import pandas as pd
+
+# Cinco jogos completos
+MINUTOS_MINIMOS_PADRAO = 450
+FORA_DAS_TAXAS = ["statistics_minutes_played", "statistics_rating"]
+# Dimensões da tabela agregada usada aqui (ver dados.carregar_agregados)
+DIMENSOES_POR_90 = ["time_alvo", "player_name"]
+
+
+def somas_por_jogador(tabela):
+    """Soma de cada statistics_* por clube e jogador (ou só por jogador, se a tabela não tiver time_alvo)."""
+    niveis = [nivel for nivel in DIMENSOES_POR_90 if nivel in tabela.index.names]
+    return tabela["soma"].groupby(level=niveis, observed=True).sum()
+
+
+def taxas_por_90(soma, minutos_minimos=0):
+    """Uma linha por jogador que entrou em campo, uma coluna por estatística, em valor por 90 minutos.
+
+    `soma` são as somas por jogador (somas_por_jogador).
+    """
+    minutos = soma["statistics_minutes_played"]
+    soma = soma[(minutos > 0) & (minutos >= minutos_minimos)]
+    contagens = soma.drop(columns=FORA_DAS_TAXAS, errors="ignore")
+    fator = 90 / soma["statistics_minutes_played"].to_numpy()
+    return pd.DataFrame(contagens.to_numpy() * fator[:, None], index=soma.index, columns=contagens.columns)
+
+
+class Por90:
+    """Taxas por 90 de todos os jogadores, com a ordem de cada estatística já calculada para rankings imediatos."""
+
+    def __init__(self, tabela):
+        soma = somas_por_jogador(tabela)
+        self.taxas = taxas_por_90(soma)
+        self.minutos = soma["statistics_minutes_played"].reindex(self.taxas.index)
+        # Ordem decrescente de todas as colunas de uma vez (um argsort na matriz inteira)
+        self._ordem = np.argsort(-self.taxas.to_numpy(), axis=0, kind="stable")
+
+    def ranking(self, coluna, minutos_minimos=MINUTOS_MINIMOS_PADRAO, top=10):
+        """Os `top` jogadores com maior `coluna` por 90, entre os que jogaram ao menos `minutos_minimos`."""
+        ordem = self._ordem[:, self.taxas.columns.get_loc(coluna)]
+        ordem = ordem[self.minutos.to_numpy()[ordem] >= minutos_minimos][:top]
+        return pd.DataFrame({
+            "minutos": self.minutos.iloc[ordem],
+            f"{coluna}_por_90": self.taxas[coluna].iloc[ordem],
+        })
@@ -0,0 +1,248 @@
+"""Gerador de partidas sintéticas com as mesmas 71 colunas da base.
+
+Os parâmetros (presença de cada estatística por posição, zeros, médias, nota,
+gols por partida, substituições, torneios) são calibrados na base real. Cada
+partida tem 22 relacionados por clube: 11 titulares (1 G, 4 D, 4 M, 2 F) e 11
+reservas, dos quais alguns entram. Quem não entra fica com todas as
+statistics_* vazias, como na base. Os gols saem de um xG latente vezes a
+eficiência de cada jogador, então xG e gols são correlacionados.
+
+Uso: python -m analise.sintetico destino.{csv,csv.gz,parquet} [--clubes N]
+     [--temporadas N] [--jogos N] [--bloco LINHAS] [--semente N]
+Linhas geradas = clubes x temporadas x jogos x 22.
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analise.dados import ARQUIVO_PADRAO
+from analise.esquema import COLUNAS_DECIMAIS, aplicar_esquema
+
+POSICOES = ["G", "D", "M", "F"]
+# Elenco de cada clube: 3 goleiros, 10 defensores, 10 meias e 7 atacantes (nessa ordem)
+ELENCO = {"G": 3, "D": 10, "M": 10, "F": 7}
+TAMANHO_ELENCO = sum(ELENCO.values())
+POSICAO_DO_ELENCO = np.repeat(np.arange(len(POSICOES)), list(ELENCO.values()))
+# Colunas (já ordenadas por posição e sorteio) de titulares e reservas, ver _escalar
+TITULARES = [0, 3, 4, 5, 6, 13, 14, 15, 16, 23, 24]
+RESERVA_GOLEIRO = 1
+RESERVAS_LINHA = [7, 8, 9, 10, 11, 12, 17, 18, 19, 20, 21, 22, 25, 26, 27, 28, 29]
+RELACIONADOS = 22
+# Jogador do elenco que é capitão quando começa jogando
+CAPITAO = 3
+ANO_INICIAL = 2015
+LINHAS_POR_BLOCO = 1_000_000
+
+# Pares (certos, total): o número de acertos não passa do total de tentativas
+PARES = [
+    ("statistics_accurate_pass", "statistics_total_pass"),
+    ("statistics_accurate_long_balls", "statistics_total_long_balls"),
+    ("statistics_accurate_cross", "statistics_total_cross"),
+    ("statistics_won_contest", "statistics_total_contest"),
+    ("statistics_accurate_keeper_sweeper", "statistics_total_keeper_sweeper"),
+]
+# Colunas com modelo próprio (as demais seguem presença/zeros/média por posição)
+ESPECIAIS = ["statistics_minutes_played", "statistics_rating", "statistics_goals", "statistics_expected_goals"]
+
+
+def calibrar(df):
+    """Parâmetros do gerador, medidos nas partidas de quem entrou em campo."""
+    jogou = df[df["statistics_minutes_played"].notna() & df["player_position"].isin(POSICOES)]
+    estatisticas = [c for c in df.columns if c.startswith("statistics_")]
+
+    colunas = {}
+    for coluna in estatisticas:
+        parametros = []
+        for posicao in POSICOES:
+            serie = jogou.loc[jogou["player_position"] == posicao, coluna].astype("float64")
+            presentes = serie.dropna()
+            positivos = presentes[presentes > 0]
+            parametros.append((
+                len(presentes) / len(serie) if len(serie) else 0.0,
+                (presentes == 0).mean() if len(presentes) else 0.0,
+                positivos.mean() if len(positivos) else 1.0,
+                positivos.std() if len(positivos) > 1 else 0.0,
+            ))
+        colunas[coluna] = np.array(parametros)
+
+    gols = jogou.groupby("player_position", observed=True)["statistics_goals"].apply(lambda s: s.fillna(0).mean())
+    sem_gol = jogou[jogou["statistics_goals"].fillna(0) == 0]
+    torneios = df.drop_duplicates(["ano", "jogo"])["tournament"].value_counts(normalize=True)
+    return {
+        "colunas": colunas,
+        "ordem": list(df.columns),
+        # Gols por partida de 90 minutos, por posição
+        "gols_por_90": np.array([gols.get(p, 0.0) for p in POSICOES]) * 90 / jogou["statistics_minutes_played"].mean(),
+        "zero_gols_registrado": sem_gol["statistics_goals"].notna().mean(),
+        "substituicoes": (df["player_sub"] & df["statistics_minutes_played"].notna()).sum() / df.groupby(["ano", "jogo"]).ngroups,
+        "jogos": int(df.groupby("ano")["jogo"].max().mean()),
+        "torneios": (torneios.index.to_numpy(dtype=object), torneios.to_numpy()),
+    }
+
+
+def _gerar_contagem(rng, parametros, codigos, decimal=False):
+    presenca, zeros, media, desvio = (parametros[codigos, i] for i in range(4))
+    n = len(codigos)
+    if decimal:
+        # Gama com a mesma média e desvio dos valores positivos
+        desvio = np.where(desvio > 0, desvio, media)
+        valores = np.round(rng.gamma((media / desvio) ** 2, desvio ** 2 / media), 2)
+    else:
+        valores = 1 + rng.poisson(np.maximum(media - 1, 0)).astype("float64")
+    valores[rng.random(n) < zeros] = 0
+    valores[rng.random(n) >= presenca] = np.nan
+    return valores
+
+
+def _escalar(rng, partidas, substituicoes):
+    """Escolhe, para cada partida, os 22 relacionados (índices no elenco) e os minutos de cada um."""
+    # Ordena o elenco por posição e, dentro da posição, ao acaso
+    ordem = np.argsort(POSICAO_DO_ELENCO + rng.random((partidas, TAMANHO_ELENCO)), axis=1)
+    reservas_linha = ordem[:, RESERVAS_LINHA]
+    reservas_linha = np.take_along_axis(reservas_linha, np.argsort(rng.random(reservas_linha.shape), axis=1)[:, :10], axis=1)
+    relacionados = np.hstack([ordem[:, TITULARES], ordem[:, [RESERVA_GOLEIRO]], reservas_linha])
+
+    # Os primeiros `trocas` reservas de linha entram no lugar de titulares de linha sorteados
+    minutos = np.full(relacionados.shape, np.nan)
+    minutos[:, :11] = 90
+    trocas = rng.binomial(10, min(substituicoes / 10, 1), partidas)
+    entrada = rng.integers(1, 46, (partidas, 10))
+    saem = 1 + np.argsort(rng.random((partidas, 10)), axis=1)
+    entrou = np.arange(10) < trocas[:, None]
+    minutos[:, 12:][entrou] = entrada[entrou]
+    linhas = np.broadcast_to(np.arange(partidas)[:, None], (partidas, 10))
+    minutos[linhas[entrou], saem[entrou]] = 90 - entrada[entrou]
+    return relacionados, minutos
+
+
+def gerar_bloco(perfil, rng, inicio, partidas, temporadas, jogos, clubes, eficiencia):
+    """Linhas das partidas globais [inicio, inicio + partidas), na ordem de colunas da base."""
+    ids = np.arange(inicio, inicio + partidas)
+    clube, resto = np.divmod(ids, temporadas * jogos)
+    temporada, jogo = np.divmod(resto, jogos)
+
+    adversario = (clube + rng.integers(1, max(clubes, 2), partidas)) % max(clubes, 2)
+    em_casa = rng.random(partidas) < 0.5
+    nomes_torneios, pesos = perfil["torneios"]
+    torneio = nomes_torneios[rng.choice(len(pesos), partidas, p=pesos)]
+
+    relacionados, minutos = _escalar(rng, partidas, perfil["substituicoes"])
+    linha_partida = np.repeat(np.arange(partidas), RELACIONADOS)
+    elenco = relacionados.ravel()
+    minutos = minutos.ravel()
+    codigos = POSICAO_DO_ELENCO[elenco]
+    jogou = ~np.isnan(minutos)
+    clube_linha = clube[linha_partida]
+
+    dados = {}
+    for coluna, parametros in perfil["colunas"].items():
+        if coluna not in ESPECIAIS:
+            dados[coluna] = np.where(jogou, _gerar_contagem(rng, parametros, codigos, coluna in COLUNAS_DECIMAIS), np.nan)
+    for certos, total in PARES:
+        dados[certos] = np.where(dados[certos] > dados[total], dados[total], dados[certos])
+
+    # Nota: normal por posição, limitada à escala do site de origem
+    _, _, media, desvio = (perfil["colunas"]["statistics_rating"][codigos, i] for i in range(4))
+    nota = np.clip(np.round(rng.normal(media, desvio), 1), 3.0, 10.0)
+    dados["statistics_rating"] = np.where(jogou, nota, np.nan)
+    dados["statistics_minutes_played"] = minutos
+
+    # xG latente proporcional aos minutos; gols ~ Poisson(xG x eficiência do jogador)
+    xg = rng.gamma(0.5, 2 * perfil["gols_por_90"][codigos] * np.nan_to_num(minutos) / 90)
+    gols = rng.poisson(xg * eficiencia[clube_linha, elenco]).astype("float64")
+    presenca_xg = perfil["colunas"]["statistics_expected_goals"][codigos, 0]
+    dados["statistics_expected_goals"] = np.where(jogou & (rng.random(len(xg)) < presenca_xg), np.round(xg, 2), np.nan)
+    registrado = (gols > 0) | (rng.random(len(gols)) < perfil["zero_gols_registrado"])
+    dados["statistics_goals"] = np.where(jogou & registrado, gols, np.nan)
+
+    # Placar: gols do clube-alvo somados; os do adversário sorteados
+    gols_clube = np.bincount(linha_partida, weights=np.nan_to_num(dados["statistics_goals"]), minlength=partidas).astype(int)
+    gols_adversario = rng.poisson(1.2, partidas)
+
+    nome_clube = np.array([f"Clube {c:04d}" for c in range(max(clubes, 2))], dtype=object)
+    nomes = np.array([[f"Jogador {c:04d}-{i + 1:02d}" for i in range(TAMANHO_ELENCO)] for c in np.unique(clube)], dtype=object)
+    clube_linha = clube_linha - clube.min()
+    alvo, outro = nome_clube[clube], nome_clube[adversario]
+    mandante, visitante = np.where(em_casa, alvo, outro), np.where(em_casa, outro, alvo)
+    por_linha = lambda valores: np.asarray(valores)[linha_partida]
+    titular = np.tile(np.arange(RELACIONADOS) < 11, partidas)
+
+    dados.update({
+        "time_alvo": por_linha(alvo),
+        "ano": por_linha(ANO_INICIAL + temporada),
+        "jogo": por_linha(jogo + 1),
+        "home_or_away": por_linha(np.where(em_casa, "home", "away")),
+        "home_team": por_linha(mandante),
+        "away_team": por_linha(visitante),
+        "stadium": por_linha(np.array([f"Estádio {m}" for m in mandante], dtype=object)),
+        "tournament": por_linha(torneio),
+        "home_score": por_linha(np.where(em_casa, gols_clube, gols_adversario)),
+        "away_score": por_linha(np.where(em_casa, gols_adversario, gols_clube)),
+        "home_manager": por_linha(np.array([f"Técnico {m}" for m in mandante], dtype=object)),
+        "away_manager": por_linha(np.array([f"Técnico {v}" for v in visitante], dtype=object)),
+        "player_name": nomes[clube_linha, elenco],
+        "player_number": elenco + 1,
+        "player_position": np.array(POSICOES, dtype=object)[codigos],
+        "player_sub": ~titular,
+        "player_captain": np.where(titular & (elenco == CAPITAO), True, None),
+    })
+    return pd.DataFrame(dados)[perfil["ordem"]]
+
+
+def gerar(destino, clubes=20, temporadas=10, jogos=None, semente=0, linhas_por_bloco=LINHAS_POR_BLOCO, base=None):
+    """Gera clubes x temporadas x jogos x 22 linhas em `destino` (.csv, .csv.gz ou .parquet), bloco a bloco.
+
+    A mesma semente (e o mesmo tamanho de bloco) gera sempre o mesmo arquivo. Devolve o número de linhas.
+    """
+    destino = Path(destino)
+    perfil = calibrar(pd.read_csv(base or ARQUIVO_PADRAO))
+    jogos = jogos or perfil["jogos"]
+
+    # Eficiência de finalização fixa por jogador ao longo de todas as partidas
+    eficiencia = np.random.default_rng([semente, 0]).lognormal(0, 0.35, (max(clubes, 2), TAMANHO_ELENCO))
+    total = clubes * temporadas * jogos
+    por_bloco = max(1, linhas_por_bloco // RELACIONADOS)
+
+    escritor = None
+    try:
+        for numero, inicio in enumerate(range(0, total, por_bloco), start=1):
+            rng = np.random.default_rng([semente, numero])
+            bloco = gerar_bloco(perfil, rng, inicio, min(por_bloco, total - inicio), temporadas, jogos, clubes, eficiencia)
+            if destino.suffix == ".parquet":
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                # Esquema compacto, com texto simples para que todos os blocos tenham o mesmo tipo
+                tipado = aplicar_esquema(bloco)
+                categorias = tipado.select_dtypes("category").columns
+                tipado[categorias] = tipado[categorias].astype(str)
+                tabela = pa.Table.from_pandas(tipado, preserve_index=False)
+                if escritor is None:
+                    escritor = pq.ParquetWriter(destino, tabela.schema, compression="zstd")
+                escritor.write_table(tabela)
+            else:
+                bloco.to_csv(destino, mode="w" if inicio == 0 else "a", header=inicio == 0, index=False)
+    finally:
+        if escritor is not None:
+            escritor.close()
+    return total * RELACIONADOS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera partidas sintéticas com o esquema da base.")
+    parser.add_argument("destino", help="arquivo .csv, .csv.gz ou .parquet")
+    parser.add_argument("--clubes", type=int, default=20)
+    parser.add_argument("--temporadas", type=int, default=10)
+    parser.add_argument("--jogos", type=int, help="jogos por temporada (padrão: o da base)")
+    parser.add_argument("--bloco", type=int, default=LINHAS_POR_BLOCO, help="linhas por bloco gravado")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    linhas = gerar(args.destino, args.clubes, args.temporadas, args.jogos, args.semente, args.bloco)
+    print(f"{linhas} linhas gravadas em {args.destino}")
+
+
+if __name__ == "__main__":
+    main()
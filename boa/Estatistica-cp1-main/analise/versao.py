@@ -0,0 +1,139 @@
+"""Impressão digital da base (tamanho + hash do conteúdo) e vigia que avisa quando ela muda.
+
+O hash só é recalculado quando tamanho ou data de modificação mudam. Se o arquivo
+apenas cresceu e o trecho final do conteúdo antigo continua igual (anexos no fim,
+como faz `--anexar`), só os bytes novos são lidos. Como a versão depende do
+conteúdo, e não da data, um `touch` no arquivo não invalida nada.
+"""
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+from analise.particoes import arquivos
+
+BYTES_POR_LEITURA = 1 << 20
+# Trecho final do conteúdo já lido, conferido antes de continuar o hash de onde parou
+BYTES_DA_CAUDA = 64 * 1024
+INTERVALO_VIGIA = 2.0
+
+# Estado do hash de cada arquivo: (tamanho, mtime_ns, objeto hashlib, digest da cauda)
+_estados = {}
+_trava = threading.Lock()
+_log = logging.getLogger(__name__)
+
+
+def _digest_da_cauda(arquivo, fim):
+    inicio = max(0, fim - BYTES_DA_CAUDA)
+    arquivo.seek(inicio)
+    return hashlib.blake2b(arquivo.read(fim - inicio), digest_size=16).digest()
+
+
+def hash_do_arquivo(caminho):
+    caminho = Path(caminho).resolve()
+    info = caminho.stat()
+    with _trava:
+        anterior = _estados.get(caminho)
+    if anterior is not None and anterior[:2] == (info.st_size, info.st_mtime_ns):
+        return anterior[2].hexdigest()
+
+    with open(caminho, "rb") as arquivo:
+        cresceu = anterior is not None and info.st_size > anterior[0]
+        if cresceu and _digest_da_cauda(arquivo, anterior[0]) == anterior[3]:
+            # Só anexaram linhas: continua o hash a partir do conteúdo antigo
+            estado = anterior[2].copy()
+            arquivo.seek(anterior[0])
+        else:
+            estado = hashlib.blake2b(digest_size=16)
+            arquivo.seek(0)
+        for bloco in iter(lambda: arquivo.read(BYTES_POR_LEITURA), b""):
+            estado.update(bloco)
+        cauda = _digest_da_cauda(arquivo, info.st_size)
+
+    with _trava:
+        _estados[caminho] = (info.st_size, info.st_mtime_ns, estado, cauda)
+    return estado.hexdigest()
+
+
+def impressao_digital(caminho):
+    """(nome, tamanho, hash do conteúdo) do arquivo ou, numa pasta particionada, de todos os arquivos dela."""
+    caminho = Path(caminho).resolve()
+    if not caminho.is_dir():
+        return (caminho.name, caminho.stat().st_size, hash_do_arquivo(caminho))
+
+    # Pasta: combina o hash de cada arquivo (só os que mudaram são relidos)
+    combinado = hashlib.blake2b(digest_size=16)
+    tamanho = 0
+    for parte in arquivos(caminho):
+        combinado.update(f"{parte.relative_to(caminho).as_posix()}={hash_do_arquivo(parte)};".encode())
+        tamanho += parte.stat().st_size
+    return (caminho.name, tamanho, combinado.hexdigest())
+
+
+class Vigia:
+    """Thread de fundo que confere a impressão digital dos caminhos observados a cada `intervalo` segundos.
+
+    Quando uma muda, chama `ao_mudar(caminho, versao_antiga, versao_nova)` na própria thread.
+    """
+
+    def __init__(self, ao_mudar, intervalo=INTERVALO_VIGIA):
+        self.ao_mudar = ao_mudar
+        self.intervalo = intervalo
+        self._versoes = {}
+        self._trava = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+
+    def observar(self, caminho, versao):
+        with self._trava:
+            self._versoes.setdefault(Path(caminho).resolve(), versao)
+
+    def versao(self, caminho):
+        """Última versão conferida de `caminho` (já resolvido), ou None se ele não é observado."""
+        with self._trava:
+            return self._versoes.get(caminho)
+
+    def ativo(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def iniciar(self):
+        with self._trava:
+            if self.ativo():
+                return
+            self._parar.clear()
+            self._thread = threading.Thread(target=self._laco, name="vigia-dados", daemon=True)
+            self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def verificar(self):
+        """Confere todos os caminhos uma vez; devolve os que mudaram."""
+        with self._trava:
+            observados = list(self._versoes.items())
+        mudaram = []
+        for caminho, antiga in observados:
+            try:
+                nova = impressao_digital(caminho)
+            except FileNotFoundError:
+                # Arquivo sendo substituído: confere de novo na próxima volta
+                continue
+            if nova != antiga:
+                with self._trava:
+                    # Outra thread pode ter conferido o mesmo caminho ao mesmo tempo: só uma avisa
+                    if self._versoes.get(caminho) != antiga:
+                        continue
+                    self._versoes[caminho] = nova
+                mudaram.append(caminho)
+                self.ao_mudar(caminho, antiga, nova)
+        return mudaram
+
+    def _laco(self):
+        while not self._parar.wait(self.intervalo):
+            try:
+                self.verificar()
+            except Exception:
+                # A vigia não pode morrer por causa de uma leitura ou remontagem com erro; avisa e tenta de novo depois
+                _log.warning("vigia dos dados: falha ao conferir ou reaquecer o cache", exc_info=True)
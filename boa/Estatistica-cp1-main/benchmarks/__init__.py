@@ -0,0 +1 @@
+# Benchmarks headless do dashboard (rodar a partir da pasta do app: python -m benchmarks.<nome>)
@@ -0,0 +1,123 @@
+"""Benchmark das etapas de dados e das análises, sem servidor do Streamlit.
+
+Para cada escala (1x, 10x e 100x as linhas da base) mede:
+- a leitura do CSV e a conversão de tipos (esquema compacto);
+- a montagem da tabela agregada;
+- o cálculo de cada uma das sete perguntas (analise.perguntas);
+- o IC e o teste t da página de intervalo de confiança;
+- a montagem dos índices e máximos da página Data Analysis e, com eles prontos, a filtragem por posição.
+
+As bases maiores são a original repetida, com os jogos renumerados para não colidirem.
+
+Uso: python -m benchmarks.desempenho [-e 1 10 100] [-r REPETICOES] [-o saida.json]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from analise.agregados import construir_agregados
+from analise.cubo import com_adversario
+from analise.dados import ARQUIVO_PADRAO, calcular_maximos
+from analise.esquema import aplicar_esquema
+from analise.estatisticas import intervalo_confianca, momentos_do_recorte, teste_t
+from analise.indices import construir_indices, filtrar_linhas
+from analise.perguntas import PERGUNTAS
+from benchmarks.inicializacao import resumo
+
+ESCALAS_PADRAO = [1, 10, 100]
+# Jogos de cada cópia da base começam em copia * DESLOCAMENTO_JOGO + 1
+DESLOCAMENTO_JOGO = 100
+
+
+def gerar_base(escala, destino):
+    """Grava em `destino` a base original repetida `escala` vezes."""
+    base = pd.read_csv(ARQUIVO_PADRAO)
+    copias = []
+    for copia in range(escala):
+        parte = base.copy()
+        parte["jogo"] = parte["jogo"] + copia * DESLOCAMENTO_JOGO
+        copias.append(parte)
+    pd.concat(copias, ignore_index=True).to_csv(destino, index=False)
+    return destino
+
+
+def intervalo_e_teste_t(tabela):
+    home = momentos_do_recorte(tabela, "statistics_rating", home_or_away="home")
+    away = momentos_do_recorte(tabela, "statistics_rating", home_or_away="away")
+    return intervalo_confianca(home), intervalo_confianca(away), teste_t(home, away)
+
+
+def indices_data_analysis(df):
+    # O que o app monta uma vez por versão da base (carregar_indices e carregar_maximos_por_posicao)
+    return construir_indices(com_adversario(df)), calcular_maximos(df)
+
+
+def filtro_data_analysis(df, indices, maximos):
+    return [len(filtrar_linhas(df, indices, player_position=p)) for p in maximos.index if p != "Todas"]
+
+
+def _cronometrar(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return resumo(tempos), resultado
+
+
+def medir_escala(escala, repeticoes, pasta):
+    caminho = gerar_base(escala, Path(pasta) / f"base_{escala}x.csv")
+    medicoes = {}
+
+    medicoes["leitura_csv"], bruto = _cronometrar(lambda: pd.read_csv(caminho), repeticoes)
+    medicoes["conversao_tipos"], df = _cronometrar(lambda: aplicar_esquema(bruto), repeticoes)
+    medicoes["agregados"], tabela = _cronometrar(lambda: construir_agregados(df), repeticoes)
+    for numero, pergunta in enumerate(PERGUNTAS.values(), start=1):
+        medicoes[f"pergunta_{numero}"], _ = _cronometrar(lambda: pergunta(tabela), repeticoes)
+    medicoes["ic_e_teste_t"], _ = _cronometrar(lambda: intervalo_e_teste_t(tabela), repeticoes)
+    medicoes["indices_data_analysis"], (indices, maximos) = _cronometrar(lambda: indices_data_analysis(df), repeticoes)
+    # Só a filtragem de cada visita, com os índices já prontos
+    medicoes["filtro_data_analysis"], _ = _cronometrar(lambda: filtro_data_analysis(df, indices, maximos), repeticoes)
+
+    return {"linhas": len(df), "bytes_csv": caminho.stat().st_size, "etapas": medicoes}
+
+
+def medir(escalas=ESCALAS_PADRAO, repeticoes=3):
+    resultados = {
+        "python": sys.version.split()[0],
+        "pandas": pd.__version__,
+        "repeticoes": repeticoes,
+        "escalas": {},
+    }
+    with tempfile.TemporaryDirectory() as pasta:
+        for escala in escalas:
+            resultados["escalas"][f"{escala}x"] = medir_escala(escala, repeticoes, pasta)
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede carga, transformação e cada análise em várias escalas da base.")
+    parser.add_argument("-e", "--escalas", type=int, nargs="+", default=ESCALAS_PADRAO)
+    parser.add_argument("-r", "--repeticoes", type=int, default=3)
+    parser.add_argument("-o", "--saida", help="arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    resultados = medir(args.escalas, args.repeticoes)
+    resultados["data"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+    for escala, medicao in resultados["escalas"].items():
+        print(f"{escala} ({medicao['linhas']} linhas)")
+        for etapa, tempos in medicao["etapas"].items():
+            print(f"  {etapa:<24} {tempos['mediana_s'] * 1000:9.1f} ms")
+
+    if args.saida:
+        Path(args.saida).write_text(json.dumps(resultados, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark de inicialização a frio das páginas do dashboard.
+
+Para cada página mede, em um interpretador novo a cada repetição:
+- o tempo dos imports de nível de módulo da página;
+- o tempo da primeira renderização (via streamlit.testing, sem servidor),
+  e, nas páginas com menu lateral, de cada opção do menu.
+
+Uso: python -m benchmarks.inicializacao [-r REPETICOES] [-o saida.json]
+"""
+import argparse
+import ast
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+PAGINAS = [RAIZ / "Home.py", *sorted((RAIZ / "pages").glob("*.py"))]
+
+_MEDIR_IMPORTS = """
+import time
+inicio = time.perf_counter()
+{imports}
+print(time.perf_counter() - inicio)
+"""
+
+_MEDIR_RENDER = """
+import sys, time
+sys.path.insert(0, {raiz!r})
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({pagina!r}, default_timeout=120)
+rotulo, opcao = {rotulo!r}, {opcao!r}
+if opcao is None:
+    inicio = time.perf_counter()
+    app.run()
+else:
+    app.run()
+    menu = next(s for s in app.sidebar.selectbox if s.label == rotulo)
+    inicio = time.perf_counter()
+    menu.select(opcao).run()
+assert not app.exception, app.exception[0].message
+print(time.perf_counter() - inicio)
+"""
+
+
+def imports_da_pagina(pagina):
+    # Só os imports de nível de módulo (os que ficam dentro de ramos são carregados sob demanda)
+    arvore = ast.parse(pagina.read_text(encoding="utf-8"))
+    return "\n".join(ast.unparse(no) for no in arvore.body if isinstance(no, (ast.Import, ast.ImportFrom)))
+
+
+def opcoes_do_menu(pagina):
+    # Rótulo e opções do primeiro selectbox da barra lateral com lista fixa, lidos do código da página
+    for no in ast.walk(ast.parse(pagina.read_text(encoding="utf-8"))):
+        if (
+            isinstance(no, ast.Call)
+            and isinstance(no.func, ast.Attribute)
+            and no.func.attr == "selectbox"
+            and ast.unparse(no.func.value) == "st.sidebar"
+            and len(no.args) > 1
+            and isinstance(no.args[1], ast.List)
+        ):
+            return ast.literal_eval(no.args[0]), [ast.literal_eval(elemento) for elemento in no.args[1].elts]
+    return None, []
+
+
+def _cronometrar(codigo):
+    saida = subprocess.run(
+        [sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True, text=True, check=True
+    )
+    return float(saida.stdout.strip().splitlines()[-1])
+
+
+def resumo(tempos):
+    """Mediana, mínimo e máximo de uma lista de tempos (em segundos), com as amostras."""
+    return {"mediana_s": statistics.median(tempos), "min_s": min(tempos), "max_s": max(tempos), "amostras": tempos}
+
+
+def medir(repeticoes=3):
+    resultados = {"python": sys.version.split()[0], "repeticoes": repeticoes, "paginas": {}}
+    for pagina in PAGINAS:
+        nome = pagina.relative_to(RAIZ).as_posix()
+        imports = _MEDIR_IMPORTS.format(imports=imports_da_pagina(pagina))
+        medicoes = {"imports": resumo([_cronometrar(imports) for _ in range(repeticoes)])}
+
+        rotulo, opcoes = opcoes_do_menu(pagina)
+        for opcao in [None, *opcoes[1:]]:
+            codigo = _MEDIR_RENDER.format(raiz=str(RAIZ), pagina=str(pagina), rotulo=rotulo, opcao=opcao)
+            chave = "primeira_renderizacao" if opcao is None else f"primeira_renderizacao: {opcao}"
+            medicoes[chave] = resumo([_cronometrar(codigo) for _ in range(repeticoes)])
+
+        resultados["paginas"][nome] = medicoes
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede imports e primeira renderização de cada página.")
+    parser.add_argument("-r", "--repeticoes", type=int, default=3)
+    parser.add_argument("-o", "--saida", help="arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    resultados = medir(args.repeticoes)
+    resultados["data"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+    for pagina, medicoes in resultados["paginas"].items():
+        print(pagina)
+        for etapa, tempos in medicoes.items():
+            print(f"  {etapa:<70} {tempos['mediana_s'] * 1000:9.1f} ms")
+
+    if args.saida:
+        Path(args.saida).write_text(json.dumps(resultados, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
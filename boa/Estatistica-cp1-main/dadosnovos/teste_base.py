@@ -1,4 +1,5 @@
 import pandas as pd  
 
-df = pd.read_csv("arquivo.csv.gz", compression="gzip")  
+# Parquet gerado por `python -m analise.ingestao dadosnovos/arquivo.csv.gz`
+df = pd.read_parquet("arquivo.parquet")
 print(df.head())  # Exibir as primeiras linhas  
@@ -1,6 +1,14 @@
+import math
+
 import streamlit as st
 import pandas as pd
-import numpy as np
+
+from analise.dados import (
+    carregar_cubo, carregar_dados, carregar_indices, carregar_maximos_por_posicao, fonte_padrao, iniciar_vigia,
+)
+from analise.indices import filtrar_linhas
+from analise.metricas import iniciar_endpoint, medir, painel_lateral
+from analise.particoes import caminho_da_particao, valores
 
 st.set_page_config(
     page_title="Análise de Jogadores",
@@ -8,38 +16,91 @@ st.set_page_config(
     layout="wide"
 )
 
-# Carrega o DataFrame do estado da sessão
-df = st.session_state["data"]
+iniciar_vigia()
+iniciar_endpoint()
+
+# Com a base particionada, só as partições do clube e da temporada escolhidos são lidas
+fonte = fonte_padrao()
+if fonte.is_dir():
+    clube = st.sidebar.selectbox("Clube", valores(fonte))
+    temporada = st.sidebar.selectbox("Temporada", ["Todas"] + valores(fonte, clube))
+    fonte = caminho_da_particao(fonte, clube, None if temporada == "Todas" else temporada)
 
-# Normaliza colunas (caso haja espaços extras)
-df.columns = df.columns.str.strip()
+# Carrega o DataFrame compartilhado (somente leitura: nada é copiado por sessão)
+with medir("data_analysis.carga"):
+    df = carregar_dados(fonte)
 
-# Substitui NaNs por 0 nas colunas numéricas (opcional e ajustável)
-df = df.fillna(0)
+    # Máximos e índices de filtro por posição, pré-calculados uma vez por processo (e por recorte)
+    maximos = carregar_maximos_por_posicao(fonte)
+    indices = carregar_indices(fonte)
+    # Cubo do mesmo recorte: totais de qualquer combinação de filtros sem somar as linhas
+    cubo = carregar_cubo(fonte)
 
 # Cria lista de posições únicas
-posicoes = ['Todas']
-posicoes = np.append(posicoes, df["player_position"].unique())
+posicoes = ['Todas'] + [p for p in maximos.index if p != 'Todas']
 
-# Filtro na barra lateral
+# Colunas exibidas por padrão (as demais podem ser escolhidas na barra lateral)
+COLUNAS_PADRAO = [
+    "ano", "jogo", "home_or_away", "home_team", "away_team", "player_name", "player_position",
+    "statistics_minutes_played", "statistics_rating", "statistics_goals", "statistics_goal_assist",
+    "statistics_expected_goals",
+]
+
+# Filtros na barra lateral
 posicao = st.sidebar.selectbox("Posição do jogador", posicoes)
+filtros = {
+    "ano": st.sidebar.multiselect("Temporada", cubo.valores("ano")),
+    "tournament": st.sidebar.multiselect("Torneio", cubo.valores("tournament")),
+    "home_or_away": st.sidebar.multiselect("Mando", cubo.valores("home_or_away")),
+    "adversario": st.sidebar.multiselect("Adversário", cubo.valores("adversario")),
+}
+# Lista vazia = sem filtro naquela dimensão
+filtros = {dimensao: valores for dimensao, valores in filtros.items() if valores}
+if posicao != 'Todas':
+    filtros["player_position"] = posicao
+colunas = st.sidebar.multiselect("Colunas", list(df.columns), default=COLUNAS_PADRAO)
+linhas_por_pagina = st.sidebar.selectbox("Linhas por página", [25, 50, 100, 200], index=1)
 st.sidebar.markdown("Desenvolvido por Guilherme Santiago")
 
 # Filtra o DataFrame com base na seleção
-if posicao == 'Todas':
-    df_filtered = df
-else:
-    df_filtered = df[df["player_position"] == posicao]
-
-# Exibe a tabela com uma coluna de destaque (ex: Gols)
-st.dataframe(
-    df_filtered,
-    column_config={
-        "statistics_goals": st.column_config.ProgressColumn(
-            "Gols",
-            format="%d",
-            min_value=0,
-            max_value=int(df_filtered["statistics_goals"].max())
-        )
-    }
-)
+with medir("data_analysis.filtro"):
+    df_filtered = filtrar_linhas(df, indices, **filtros)
+    total_recorte = cubo.consultar(**filtros).iloc[0]
+
+# Paginação no servidor: só a página visível vai para o navegador
+total = len(df_filtered)
+paginas = max(1, math.ceil(total / linhas_por_pagina))
+pagina = st.sidebar.number_input("Página", min_value=1, max_value=paginas, value=1, step=1)
+inicio = (pagina - 1) * linhas_por_pagina
+fim = min(inicio + linhas_por_pagina, total)
+
+df_pagina = df_filtered.iloc[inicio:fim][colunas or COLUNAS_PADRAO]
+
+# Substitui NaNs por 0 nas colunas numéricas, só na página exibida
+numericas = df_pagina.select_dtypes("number").columns
+df_pagina[numericas] = df_pagina[numericas].fillna(0)
+
+# Coluna de destaque (ex: Gols), com o máximo vindo da tabela pré-calculada
+column_config = {}
+if "statistics_goals" in df_pagina.columns:
+    maximo_gols = maximos.loc[posicao, "statistics_goals"]
+    column_config["statistics_goals"] = st.column_config.ProgressColumn(
+        "Gols",
+        format="%d",
+        min_value=0,
+        max_value=max(1, int(maximo_gols) if pd.notna(maximo_gols) else 0)
+    )
+
+# Resumo do recorte filtrado, vindo do cubo
+minutos, gols, nota = st.columns(3)
+minutos.metric("Minutos jogados", f"{total_recorte['soma', 'statistics_minutes_played']:,.0f}".replace(",", "."))
+gols.metric("Gols", f"{total_recorte['soma', 'statistics_goals']:.0f}")
+peso = total_recorte["peso", "statistics_rating"]
+nota.metric("Nota média (ponderada pelos minutos)", f"{total_recorte['ponderada', 'statistics_rating'] / peso:.2f}" if peso else "–")
+
+st.caption(f"Linhas {inicio + 1 if total else 0}–{fim} de {total} (página {pagina} de {paginas})")
+with medir("data_analysis.render"):
+    st.dataframe(df_pagina, column_config=column_config)
+
+# Tempo das etapas (só com ?perfil=1 na URL)
+painel_lateral()
@@ -1,21 +1,22 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from scipy import stats
-
-# Verificar se os dados estão presentes no session state
-if "data" not in st.session_state:
-    st.error("Dados não carregados no session state!")
-    st.stop()
 
-# Carregamento da base de dados
-df = st.session_state["data"]
+from analise.bootstrap import bootstrap_por_grupo
+from analise.dados import (
+    carregar_agregados, carregar_cubo, carregar_frame_analitico, carregar_indices, iniciar_vigia, versao_atual,
+)
+from analise.estatisticas import intervalo_confianca, momentos_do_recorte
+from analise.graficos import renderizar
+from analise.indices import filtrar_linhas
+from analise.metricas import iniciar_endpoint, medir, painel_lateral
 
-# Verificar se as colunas esperadas estão presentes no DataFrame
-if "statistics_rating" not in df.columns or "home_or_away" not in df.columns:
-    st.error("As colunas 'statistics_rating' ou 'home_or_away' não estão presentes no DataFrame.")
-    st.stop()
+iniciar_vigia()
+iniciar_endpoint()
+
+with medir("ic.carga"):
+    # Tabela agregada compartilhada (momentos por jogador x mando x ano)
+    tabela = carregar_agregados()
+    # Cubo com as dimensões de filtro (temporada, torneio, posição, adversário...)
+    cubo = carregar_cubo()
 
 # Título da página
 st.title("📘 Intervalo de Confiança (IC) - Desempenho do Jogador")
@@ -43,22 +44,30 @@ Onde:
 st.subheader("🔍 Aplicação prática")
 st.markdown("Vamos aplicar o IC para comparar o **rating de desempenho** dos jogadores **em casa** e **fora de casa**.")
 
-# Função para intervalo de confiança
-def intervalo_confianca(amostra, confianca=0.95):
-    media = np.mean(amostra)
-    desvio = np.std(amostra, ddof=1)
-    n = len(amostra)
-    z = stats.norm.ppf((1 + confianca) / 2)
-    erro = z * desvio / np.sqrt(n)
-    return media, media - erro, media + erro
-
-# Filtrar dados de "em casa" e "fora de casa"
-rating_home = df[df['home_or_away'] == 'home']["statistics_rating"].dropna()
-rating_away = df[df['home_or_away'] == 'away']["statistics_rating"].dropna()
+# Filtros da barra lateral: cada combinação é respondida pelo cubo, sem reler as partidas
+filtros = {
+    "ano": st.sidebar.multiselect("Temporada", cubo.valores("ano")),
+    "tournament": st.sidebar.multiselect("Torneio", cubo.valores("tournament")),
+    "player_position": st.sidebar.multiselect("Posição", cubo.valores("player_position")),
+    "adversario": st.sidebar.multiselect("Adversário", cubo.valores("adversario")),
+}
+# Lista vazia = sem filtro naquela dimensão
+filtros = {dimensao: valores for dimensao, valores in filtros.items() if valores}
+with medir("ic.filtro"):
+    recorte = cubo.consultar(por=("home_or_away",), **filtros)
+
+# Momentos do rating "em casa" e "fora de casa"
+momentos_home = momentos_do_recorte(recorte, "statistics_rating", home_or_away="home")
+momentos_away = momentos_do_recorte(recorte, "statistics_rating", home_or_away="away")
+if min(momentos_home.n, momentos_away.n) < 2:
+    st.warning("Poucas partidas com rating para esses filtros (em casa e fora). Amplie a seleção na barra lateral.")
+    painel_lateral()
+    st.stop()
 
 # Aplicando a função
-media_home, ic_inf_home, ic_sup_home = intervalo_confianca(rating_home)
-media_away, ic_inf_away, ic_sup_away = intervalo_confianca(rating_away)
+with medir("ic.calculo"):
+    media_home, ic_inf_home, ic_sup_home = intervalo_confianca(momentos_home)
+    media_away, ic_inf_away, ic_sup_away = intervalo_confianca(momentos_away)
 
 # Exibição dos resultados
 st.markdown(f"""
@@ -90,6 +99,9 @@ Ao longo do projeto, o uso do IC possibilitará uma compreensão mais precisa da
 O **IC** não só valida a consistência das medições, mas também fornece uma base sólida para **decisões baseadas em dados**, ajudando na interpretação do impacto de variáveis como o local de jogo ou a quantidade de minutos jogados no desempenho geral dos atletas. Dessa forma, ao aplicarmos o IC, garantimos que nossas análises são confiáveis e com fundamento estatístico robusto.
 """)
 def plot_ic():
+    # matplotlib só é carregado quando o gráfico precisa ser desenhado
+    import matplotlib.pyplot as plt
+
     categorias = ['Em Casa', 'Fora de Casa']
     medias = [media_home, media_away]
     ic_inferiores = [ic_inf_home, ic_inf_away]
@@ -98,14 +110,50 @@ def plot_ic():
     erro_inferior = [media - inf for media, inf in zip(medias, ic_inferiores)]
     erro_superior = [sup - media for media, sup in zip(medias, ic_superiores)]
 
-    plt.figure(figsize=(8, 6))
-    bars = plt.bar(categorias, medias, yerr=[erro_inferior, erro_superior], capsize=10, color=['blue', 'orange'])
+    fig, ax = plt.subplots(figsize=(8, 6))
+    bars = ax.bar(categorias, medias, yerr=[erro_inferior, erro_superior], capsize=10, color=['blue', 'orange'])
 
-    plt.title('Intervalo de Confiança para o Rating de Desempenho dos Jogadores')
-    plt.xlabel('Local de Jogo')
-    plt.ylabel('Rating de Desempenho')
+    ax.set_title('Intervalo de Confiança para o Rating de Desempenho dos Jogadores')
+    ax.set_xlabel('Local de Jogo')
+    ax.set_ylabel('Rating de Desempenho')
 
-    plt.ylim(min(ic_inferiores) - 0.5, 7)  
+    ax.set_ylim(min(ic_inferiores) - 0.5, 7)  
+
+    return fig
+chave_filtros = tuple((dimensao, tuple(valores)) for dimensao, valores in sorted(filtros.items()))
+with medir("ic.grafico"):
+    st.image(renderizar(("intervalo de confiança", chave_filtros, versao_atual()), plot_ic))
+
+st.markdown("---")
+st.subheader("🎲 Intervalo bootstrap por jogador")
+st.markdown("""
+O IC acima usa a aproximação normal, que falha para jogadores com **poucas partidas** e para métricas **assimétricas** como gols e xG.
+No **bootstrap**, as partidas de cada jogador são reamostradas milhares de vezes e o intervalo é lido nos percentis dessas reamostras (ou com a correção **BCa**, que ajusta viés e assimetria).
+""")
 
-    st.pyplot(plt)
-plot_ic()
\ No newline at end of file
+# Métricas disponíveis para o bootstrap
+metricas = {
+    "Rating": "statistics_rating",
+    "Gols": "statistics_goals",
+    "Expected goals (xG)": "statistics_expected_goals",
+}
+anos = sorted(tabela.index.get_level_values("ano").unique())
+
+col1, col2, col3 = st.columns(3)
+metrica = metricas[col1.selectbox("Métrica", list(metricas))]
+temporada = col2.selectbox("Temporada", anos, index=len(anos) - 1)
+metodo = col3.selectbox("Método", ["percentil", "bca"])
+
+partidas = carregar_frame_analitico(colunas=["player_name", "ano", "statistics_minutes_played", metrica])
+partidas = filtrar_linhas(partidas, carregar_indices(), ano=temporada)
+if metrica != "statistics_rating":
+    # Sem registro = nenhum evento na partida (considerando só quem entrou em campo)
+    partidas = partidas[partidas["statistics_minutes_played"].notna()]
+    partidas[metrica] = partidas[metrica].fillna(0)
+
+with medir(f"ic.bootstrap.{metodo}"):
+    intervalos = bootstrap_por_grupo(partidas, metrica, metodo=metodo, semente=42)
+st.dataframe(intervalos.round(3))
+
+# Tempo das etapas (só com ?perfil=1 na URL)
+painel_lateral()
@@ -1,12 +1,15 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import scipy.stats as stats
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.figure_factory as ff
-import matplotlib.pyplot as plt
-from plotnine import *
+
+from analise.dados import (
+    carregar_cubo, carregar_frame_analitico, carregar_indices, carregar_pergunta, iniciar_vigia, versao_atual,
+)
+from analise.graficos import renderizar
+from analise.metricas import iniciar_endpoint, medir, painel_lateral
+
+# Os cálculos ficam em analise.perguntas (pré-calculados por `python -m analise.lote`
+# quando houver resultados da versão atual). matplotlib e scipy são importados só
+# dentro das perguntas que os usam, para não pesar na inicialização da página. Os
+# gráficos ficam no cache de imagens, chaveados por pergunta e versão dos dados.
 
 # Configuração da página
 st.set_page_config(page_title="Análise de Jogadores", layout="wide")
@@ -28,6 +31,12 @@ menu = st.sidebar.selectbox("Escolha a Página:", [
 
 st.sidebar.markdown("Desenvolvido por **Guilherme Santiago**")
 
+iniciar_vigia()
+iniciar_endpoint()
+
+# Versão dos dados, parte da chave dos gráficos em cache
+versao = versao_atual()
+
 # Página Principal
 if menu == "Página Principal":
     st.title("Dashboard - Análise de Jogadores")
@@ -44,18 +53,16 @@ if menu == "Página Principal":
 elif menu == "Pergunta 1 - Desempenho Casa vs Fora":
     st.title("Desempenho: Casa vs Fora")
     st.markdown("**Pergunta:** Há diferença significativa no desempenho dos jogadores entre jogos em casa e fora?")
-    
-    # Verificar se os dados estão presentes no session state
-    if "data" not in st.session_state:
-        st.error("Dados não carregados no session state!")
-        st.stop()
 
-    # Carregamento da base de dados
-    df = st.session_state["data"]
+    from analise.estatisticas import teste_permutacao
+    from analise.indices import posicoes
+    
+    # Frame analítico compartilhado (já tipado), usado só para a distribuição do boxplot
+    df = carregar_frame_analitico(colunas=['home_or_away', 'statistics_rating'])
 
     # Verificar se as colunas esperadas estão presentes no DataFrame
-    if "statistics_rating" not in df.columns or "home_or_away" not in df.columns or "statistics_minutes_played" not in df.columns:
-        st.error("As colunas 'statistics_rating', 'home_or_away' ou 'statistics_minutes_played' não estão presentes no DataFrame.")
+    if "statistics_rating" not in df.columns or "home_or_away" not in df.columns:
+        st.error("As colunas 'statistics_rating' ou 'home_or_away' não estão presentes no DataFrame.")
         st.stop()
 
     # Título da página
@@ -65,41 +72,57 @@ elif menu == "Pergunta 1 - Desempenho Casa vs Fora":
     Neste estudo, vamos comparar o desempenho dos jogadores em casa e fora de casa, levando em conta o **tempo jogado**. A análise será feita com base em médias ponderadas e teste t para verificar se há diferença significativa entre o desempenho em casa e fora.
     """)
     
-    # Função para calcular a média ponderada
-    def media_ponderada(desempenho, tempo_jogado):
-        return np.sum(desempenho * tempo_jogado) / np.sum(tempo_jogado)
-
-    # Função para intervalo de confiança
-    def intervalo_confianca(amostra, confianca=0.95):
-        media = np.mean(amostra)
-        desvio = np.std(amostra, ddof=1)
-        n = len(amostra)
-        z = stats.norm.ppf((1 + confianca) / 2)
-        erro = z * desvio / np.sqrt(n)
-        return media, media - erro, media + erro
-
-    # Função para teste t de Student
-    def teste_t(amostra_1, amostra_2):
-        t_stat, p_value = stats.ttest_ind(amostra_1, amostra_2, equal_var=False)
-        return t_stat, p_value
-
-    # Filtrar dados de "em casa" e "fora de casa"
-    rating_home = df[df['home_or_away'] == 'home']["statistics_rating"].dropna()
-    rating_away = df[df['home_or_away'] == 'away']["statistics_rating"].dropna()
-
-    time_played_home = df[df['home_or_away'] == 'home']["statistics_minutes_played"].dropna()
-    time_played_away = df[df['home_or_away'] == 'away']["statistics_minutes_played"].dropna()
-
-    # Calcular a média ponderada para desempenho (considerando o tempo jogado)
-    media_ponderada_home = media_ponderada(rating_home, time_played_home)
-    media_ponderada_away = media_ponderada(rating_away, time_played_away)
-
-    # Aplicando a função do IC para as duas amostras
-    media_home, ic_inf_home, ic_sup_home = intervalo_confianca(rating_home)
-    media_away, ic_inf_away, ic_sup_away = intervalo_confianca(rating_away)
-
-    # Teste t para diferença de médias
-    t_stat, p_value = teste_t(rating_home, rating_away)
+    # Filtros da barra lateral, respondidos pelo cubo (sem filtro, vale o resultado da base inteira)
+    cubo = carregar_cubo()
+    filtros = {
+        "ano": st.sidebar.multiselect("Temporada", cubo.valores("ano")),
+        "tournament": st.sidebar.multiselect("Torneio", cubo.valores("tournament")),
+        "player_position": st.sidebar.multiselect("Posição", cubo.valores("player_position")),
+        "adversario": st.sidebar.multiselect("Adversário", cubo.valores("adversario")),
+    }
+    filtros = {dimensao: valores for dimensao, valores in filtros.items() if valores}
+    chave_filtros = tuple((dimensao, tuple(valores)) for dimensao, valores in sorted(filtros.items()))
+
+    # Médias ponderadas pelo tempo jogado, IC 95% e teste t de casa e fora,
+    # calculados a partir da tabela agregada (ou do cubo, com filtros) sem reler as partidas
+    with medir("pergunta_1.calculo"):
+        if filtros:
+            from analise.perguntas import casa_fora
+
+            recorte = cubo.consultar(por=("home_or_away",), **filtros)
+            if min(recorte["n", "statistics_rating"].reindex(["home", "away"], fill_value=0)) < 2:
+                st.warning("Poucas partidas com rating para esses filtros (em casa e fora). Amplie a seleção na barra lateral.")
+                painel_lateral()
+                st.stop()
+            resultado = casa_fora(recorte)
+        else:
+            resultado = carregar_pergunta("casa_fora")
+    media_ponderada_home = resultado["media_ponderada_home"]
+    media_ponderada_away = resultado["media_ponderada_away"]
+    media_home, ic_inf_home, ic_sup_home = resultado["media_home"], resultado["ic_inf_home"], resultado["ic_sup_home"]
+    media_away, ic_inf_away, ic_sup_away = resultado["media_away"], resultado["ic_inf_away"], resultado["ic_sup_away"]
+
+    # Ratings individuais (boxplot e teste de permutação)
+    indices = carregar_indices()
+    rating_home = df["statistics_rating"].iloc[posicoes(indices, home_or_away='home', **filtros)].dropna()
+    rating_away = df["statistics_rating"].iloc[posicoes(indices, home_or_away='away', **filtros)].dropna()
+
+    # Teste de significância: t de Welch (supõe normalidade) ou permutação (não supõe)
+    tipo_teste = st.sidebar.radio("Teste de significância", ["Teste t (Welch)", "Permutação"])
+    if tipo_teste == "Permutação":
+        with medir("pergunta_1.permutacao"):
+            diferenca, p_value, permutacoes = teste_permutacao(rating_home, rating_away, semente=42)
+        texto_teste = f"""### 🔍 Teste de Permutação para Diferença de Médias
+
+    - Diferença de médias (casa - fora): {diferenca:.3f}
+    - Permutações realizadas: {permutacoes}
+    - Valor p: {p_value:.4f}"""
+    else:
+        t_stat, p_value = resultado["t_stat"], resultado["p_value"]
+        texto_teste = f"""### 🔍 Teste t para Diferença de Médias
+
+    - Estatística t: {t_stat:.2f}
+    - Valor p: {p_value:.4f}"""
 
     # Exibição dos resultados
     st.markdown(f"""
@@ -118,36 +141,43 @@ elif menu == "Pergunta 1 - Desempenho Casa vs Fora":
 
     
 
-    ### 🔍 Teste t para Diferença de Médias
-
-    - Estatística t: {t_stat:.2f}
-    - Valor p: {p_value:.4f}
+    {texto_teste}
 
     ---
     **Interpretação:**
     - Se o valor p for menor que 0.05, podemos rejeitar a hipótese nula e concluir que **há uma diferença significativa** no desempenho dos jogadores entre jogos em casa e fora de casa.
     """)
-    fig, ax = plt.subplots()
-    labels = ['Casa', 'Fora']
-    valores = [media_ponderada_home, media_ponderada_away]
-    cores = ['#1f77b4', '#ff7f0e']
+    def desenhar():
+        import matplotlib.pyplot as plt
+
+        fig, ax = plt.subplots()
+        labels = ['Casa', 'Fora']
+        valores = [media_ponderada_home, media_ponderada_away]
+        cores = ['#1f77b4', '#ff7f0e']
+
+        ax.bar(labels, valores, color=cores)
+        ax.set_ylabel('Média Ponderada do Rating')
+        ax.set_title('Desempenho dos Jogadores: Casa vs Fora')
+        ax.set_ylim(5,7)
+        return fig
 
-    ax.bar(labels, valores, color=cores)
-    ax.set_ylabel('Média Ponderada do Rating')
-    ax.set_title('Desempenho dos Jogadores: Casa vs Fora')
-    plt.ylim(5,7)
+    with medir("pergunta_1.grafico"):
+        st.image(renderizar(("pergunta 1", 1, chave_filtros, versao), desenhar))
 
-    st.pyplot(fig)
+    def desenhar():
+        import matplotlib.pyplot as plt
 
-    fig2, ax2 = plt.subplots()
-    ax2.boxplot([rating_home, rating_away], labels=['Casa', 'Fora'], patch_artist=True,
-            boxprops=dict(facecolor='#1f77b4'),
-            medianprops=dict(color='black'))
+        fig2, ax2 = plt.subplots()
+        ax2.boxplot([rating_home, rating_away], tick_labels=['Casa', 'Fora'], patch_artist=True,
+                boxprops=dict(facecolor='#1f77b4'),
+                medianprops=dict(color='black'))
 
-    ax2.set_title('Distribuição do Rating: Casa vs Fora')
-    ax2.set_ylabel('Rating')
+        ax2.set_title('Distribuição do Rating: Casa vs Fora')
+        ax2.set_ylabel('Rating')
+        return fig2
 
-    st.pyplot(fig2)
+    with medir("pergunta_1.grafico"):
+        st.image(renderizar(("pergunta 1", 2, chave_filtros, versao), desenhar))
     # Conclusão baseada no valor-p
     if p_value < 0.05:
         st.markdown("📌 **Conclusão:** Existe uma diferença estatisticamente significativa no desempenho dos jogadores entre os jogos em casa e fora de casa.")
@@ -161,25 +191,25 @@ elif menu == "Pergunta 2 - xG vs Gols":
     st.title("Relação: Expected Goals (xG) vs Gols")
     st.markdown("**Pergunta:** Existe relação entre os expected goals (xG) e os gols marcados pelos jogadores?")
     
-    # Carregamento dos dados
-    df = pd.read_csv("dados-completos-Ituano.csv", sep=",", encoding="utf-8")
+    # Totais de xG e gols por jogador
+    with medir("pergunta_2.calculo"):
+        df_grouped = carregar_pergunta("xg_vs_gols")
 
-    # Conversão de colunas para numérico
-    df['statistics_expected_goals'] = pd.to_numeric(df['statistics_expected_goals'], errors='coerce')
-    df['statistics_goals'] = pd.to_numeric(df['statistics_goals'], errors='coerce')
 
-    # Agrupamento por jogador
-    df_grouped = df.groupby('player_name')[['statistics_expected_goals', 'statistics_goals']].sum().dropna()
+    # Gráfico de dispersão
+    def desenhar():
+        import matplotlib.pyplot as plt
 
+        fig, ax = plt.subplots()
+        ax.scatter(df_grouped['statistics_expected_goals'], df_grouped['statistics_goals'], alpha=0.7)
+        ax.set_title("Relação entre Expected Goals (xG) e Gols Marcados")
+        ax.set_xlabel("Expected Goals (xG)")
+        ax.set_ylabel("Gols Marcados")
+        ax.grid(True)
+        return fig
 
-    # Gráfico de dispersão
-    fig, ax = plt.subplots()
-    ax.scatter(df_grouped['statistics_expected_goals'], df_grouped['statistics_goals'], alpha=0.7)
-    ax.set_title("Relação entre Expected Goals (xG) e Gols Marcados")
-    ax.set_xlabel("Expected Goals (xG)")
-    ax.set_ylabel("Gols Marcados")
-    ax.grid(True)
-    st.pyplot(fig)
+    with medir("pergunta_2.grafico"):
+        st.image(renderizar(("pergunta 2", 1, versao), desenhar))
 
     # Análise textual
     st.markdown("""
@@ -192,37 +222,25 @@ elif menu == "Pergunta 3 - Gols e Assistências por Minuto":
     st.title("Eficiência Ofensiva por Minuto")
     st.markdown("**Pergunta:** Quais jogadores mais contribuíram com gols e assistências por minuto jogado?")
 
-    # Carregamento dos dados
-    df = pd.read_csv("dados-completos-Ituano.csv", sep=",", encoding="utf-8")
-
-    # Conversão para numérico
-    df['statistics_goals'] = pd.to_numeric(df['statistics_goals'], errors='coerce')
-    df['statistics_goal_assist'] = pd.to_numeric(df['statistics_goal_assist'], errors='coerce')
-    df['statistics_minutes_played'] = pd.to_numeric(df['statistics_minutes_played'], errors='coerce')
-
-    # Agrupamento por jogador e soma
-    df_grouped = df.groupby('player_name')[['statistics_goals', 'statistics_goal_assist', 'statistics_minutes_played']].sum()
+    # Top 10 jogadores em gols + assistências por minuto jogado
+    with medir("pergunta_3.calculo"):
+        df_top = carregar_pergunta("contribuicao_por_minuto")
 
-    # Remover jogadores sem minutos jogados
-    df_grouped = df_grouped[df_grouped['statistics_minutes_played'] > 0]
 
-    # Calcular contribuições ofensivas por minuto
-    df_grouped['contribuicao_por_minuto'] = (
-        (df_grouped['statistics_goals'] + df_grouped['statistics_goal_assist']) / df_grouped['statistics_minutes_played']
-    )
-
-    # Selecionar os top 10 jogadores
-    df_top = df_grouped.sort_values(by='contribuicao_por_minuto', ascending=False).head(10)
+    # Gráfico de barras
+    def desenhar():
+        import matplotlib.pyplot as plt
 
+        fig, ax = plt.subplots(figsize=(10, 6))
+        df_top['contribuicao_por_minuto'].plot(kind='barh', ax=ax, color='skyblue')
+        ax.set_xlabel("Gols + Assistências por Minuto")
+        ax.set_ylabel("Jogadores")
+        ax.set_title("Top 10 Jogadores Mais Eficientes Ofensivamente (por Minuto)")
+        fig.tight_layout()
+        return fig
 
-    # Gráfico de barras
-    fig, ax = plt.subplots(figsize=(10, 6))
-    df_top['contribuicao_por_minuto'].plot(kind='barh', ax=ax, color='skyblue')
-    ax.set_xlabel("Gols + Assistências por Minuto")
-    ax.set_ylabel("Jogadores")
-    ax.set_title("Top 10 Jogadores Mais Eficientes Ofensivamente (por Minuto)")
-    plt.tight_layout()
-    st.pyplot(fig)
+    with medir("pergunta_3.grafico"):
+        st.image(renderizar(("pergunta 3", 1, versao), desenhar))
 
     # Conclusão
     st.markdown("""
@@ -235,30 +253,25 @@ elif menu == "Pergunta 4 - Nota de Desempenho vs G/A":
     st.title("Nota vs Participações Ofensivas")
     st.markdown("**Pergunta:** Os jogadores com maior nota de desempenho também são os que mais marcaram gols ou deram assistências?")
     
-    # Carregamento dos dados
-    df = pd.read_csv("dados-completos-Ituano.csv", sep=",", encoding="utf-8")
+    # Nota média e participações ofensivas por jogador (sem os jogadores sem nota)
+    with medir("pergunta_4.calculo"):
+        df_grouped = carregar_pergunta("nota_vs_participacoes")
 
-    # Conversão de colunas relevantes para numérico
-    df['statistics_rating'] = pd.to_numeric(df['statistics_rating'], errors='coerce')
-    df['statistics_goals'] = pd.to_numeric(df['statistics_goals'], errors='coerce')
-    df['statistics_goal_assist'] = pd.to_numeric(df['statistics_goal_assist'], errors='coerce')
 
-    # Agrupamento por jogador
-    df_grouped = df.groupby('player_name')[['statistics_rating', 'statistics_goals', 'statistics_goal_assist']].mean()
-    df_grouped['participacoes_ofensivas'] = df.groupby('player_name')[['statistics_goals', 'statistics_goal_assist']].sum().sum(axis=1)
+    # Gráfico de dispersão
+    def desenhar():
+        import matplotlib.pyplot as plt
 
-    # Remover jogadores com nota nula
-    df_grouped = df_grouped.dropna(subset=['statistics_rating', 'participacoes_ofensivas'])
+        fig, ax = plt.subplots()
+        ax.scatter(df_grouped['participacoes_ofensivas'], df_grouped['statistics_rating'], alpha=0.7)
+        ax.set_xlabel("Participações Ofensivas (Gols + Assistências)")
+        ax.set_ylabel("Nota Média de Desempenho")
+        ax.set_title("Nota de Desempenho vs Participações Ofensivas")
+        ax.grid(True)
+        return fig
 
-
-    # Gráfico de dispersão
-    fig, ax = plt.subplots()
-    ax.scatter(df_grouped['participacoes_ofensivas'], df_grouped['statistics_rating'], alpha=0.7)
-    ax.set_xlabel("Participações Ofensivas (Gols + Assistências)")
-    ax.set_ylabel("Nota Média de Desempenho")
-    ax.set_title("Nota de Desempenho vs Participações Ofensivas")
-    ax.grid(True)
-    st.pyplot(fig)
+    with medir("pergunta_4.grafico"):
+        st.image(renderizar(("pergunta 4", 1, versao), desenhar))
 
     # Conclusão
     st.markdown("""
@@ -271,26 +284,9 @@ elif menu == "Pergunta 5 - xG Alto vs Gols Baixos":
     st.title("Jogadores com xG alto e poucos gols")
     st.markdown("**Pergunta:** Há jogadores com alta taxa de expected goals (xG), mas com baixa concretização em gols?")
     
-    # Carregamento dos dados
-    df = pd.read_csv("dados-completos-Ituano.csv", sep=",", encoding="utf-8")
-
-    # Conversão para numérico
-    df['statistics_expected_goals'] = pd.to_numeric(df['statistics_expected_goals'], errors='coerce')
-    df['statistics_goals'] = pd.to_numeric(df['statistics_goals'], errors='coerce')
-
-    # Agrupamento por jogador
-    df_grouped = df.groupby('player_name')[['statistics_expected_goals', 'statistics_goals']].sum()
-
-    # Cálculo da diferença entre xG e Gols
-    df_grouped['diferenca'] = df_grouped['statistics_expected_goals'] - df_grouped['statistics_goals']
-
-    # Filtrar jogadores com xG acima da média e gols abaixo da média
-    media_xg = df_grouped['statistics_expected_goals'].mean()
-    media_gols = df_grouped['statistics_goals'].mean()
-    df_filtrado = df_grouped[(df_grouped['statistics_expected_goals'] > media_xg) & (df_grouped['statistics_goals'] < media_gols)]
-
-    # Ordenar pelos que mais 'devem' gols
-    df_filtrado = df_filtrado.sort_values(by='diferenca', ascending=False).head(10)
+    # xG acima da média e gols abaixo da média, ordenados pelos que mais 'devem' gols
+    with medir("pergunta_5.calculo"):
+        df_filtrado = carregar_pergunta("xg_alto_gols_baixos")
 
 
     # Exibição em tabela
@@ -308,25 +304,25 @@ elif menu == "Pergunta 6 - Passes Certos vs Nota":
     st.markdown("**Pergunta:** Existe relação entre o número de passes certos e a nota de desempenho do jogador?")
     
 
-    # Carregamento dos dados
-    df = pd.read_csv("dados-completos-Ituano.csv", sep=",", encoding="utf-8")
+    # Médias de passes certos e nota por jogador
+    with medir("pergunta_6.calculo"):
+        df_grouped = carregar_pergunta("passes_vs_nota")
 
-    # Conversão das colunas necessárias
-    df['statistics_accurate_pass'] = pd.to_numeric(df['statistics_accurate_pass'], errors='coerce')
-    df['statistics_rating'] = pd.to_numeric(df['statistics_rating'], errors='coerce')
 
-    # Agrupamento por jogador
-    df_grouped = df.groupby('player_name')[['statistics_accurate_pass', 'statistics_rating']].mean().dropna()
+    # Gráfico de dispersão
+    def desenhar():
+        import matplotlib.pyplot as plt
 
+        fig, ax = plt.subplots()
+        ax.scatter(df_grouped['statistics_accurate_pass'], df_grouped['statistics_rating'], alpha=0.7)
+        ax.set_xlabel("Média de Passes Certos")
+        ax.set_ylabel("Nota Média de Desempenho")
+        ax.set_title("Passes Certos vs Nota de Desempenho")
+        ax.grid(True)
+        return fig
 
-    # Gráfico de dispersão
-    fig, ax = plt.subplots()
-    ax.scatter(df_grouped['statistics_accurate_pass'], df_grouped['statistics_rating'], alpha=0.7)
-    ax.set_xlabel("Média de Passes Certos")
-    ax.set_ylabel("Nota Média de Desempenho")
-    ax.set_title("Passes Certos vs Nota de Desempenho")
-    ax.grid(True)
-    st.pyplot(fig)
+    with medir("pergunta_6.grafico"):
+        st.image(renderizar(("pergunta 6", 1, versao), desenhar))
 
     # Conclusão
     st.markdown("""
@@ -339,34 +335,25 @@ elif menu == "Pergunta 7 - Alta Eficiência com Pouco Tempo":
     st.title("Eficiência em Pouco Tempo de Jogo")
     st.markdown("**Pergunta:** Quais jogadores entregaram mais resultados com menos tempo em campo ou com menos participações ofensivas?")
 
-    # Carregamento dos dados
-    df = pd.read_csv("dados-completos-Ituano.csv", sep=",", encoding="utf-8")
+    # Entre os 20 jogadores com menos tempo em campo, os 10 mais eficientes (gols + assistências por minuto)
+    with medir("pergunta_7.calculo"):
+        df_top_eficientes = carregar_pergunta("eficiencia_pouco_tempo")
 
-    # Conversão das colunas necessárias
-    df['statistics_minutes_played'] = pd.to_numeric(df['statistics_minutes_played'], errors='coerce')
-    df['statistics_goals'] = pd.to_numeric(df['statistics_goals'], errors='coerce')
-    df['statistics_goal_assist'] = pd.to_numeric(df['statistics_goal_assist'], errors='coerce')
 
-    # Agrupamento por jogador
-    df_grouped = df.groupby('player_name')[['statistics_minutes_played', 'statistics_goals', 'statistics_goal_assist']].sum()
-    df_grouped = df_grouped[df_grouped['statistics_minutes_played'] > 0]
-
-    # Calcular eficiência (gols + assistências por minuto)
-    df_grouped['eficiencia'] = (df_grouped['statistics_goals'] + df_grouped['statistics_goal_assist']) / df_grouped['statistics_minutes_played']
-
-    # Jogadores com menos tempo em campo e alta eficiência
-    df_filtrado = df_grouped.sort_values(by='statistics_minutes_played').head(20)
-    df_top_eficientes = df_filtrado.sort_values(by='eficiencia', ascending=False).head(10)
+    # Gráfico
+    def desenhar():
+        import matplotlib.pyplot as plt
 
+        fig, ax = plt.subplots(figsize=(10, 6))
+        df_top_eficientes['eficiencia'].plot(kind='barh', ax=ax, color='seagreen')
+        ax.set_xlabel("Eficiência (Gols + Assistências / Minuto)")
+        ax.set_ylabel("Jogadores")
+        ax.set_title("Top 10 Jogadores Mais Eficientes com Pouco Tempo em Campo")
+        fig.tight_layout()
+        return fig
 
-    # Gráfico
-    fig, ax = plt.subplots(figsize=(10, 6))
-    df_top_eficientes['eficiencia'].plot(kind='barh', ax=ax, color='seagreen')
-    ax.set_xlabel("Eficiência (Gols + Assistências / Minuto)")
-    ax.set_ylabel("Jogadores")
-    ax.set_title("Top 10 Jogadores Mais Eficientes com Pouco Tempo em Campo")
-    plt.tight_layout()
-    st.pyplot(fig)
+    with medir("pergunta_7.grafico"):
+        st.image(renderizar(("pergunta 7", 1, versao), desenhar))
 
     # Conclusão
     st.markdown("""
@@ -374,3 +361,5 @@ elif menu == "Pergunta 7 - Alta Eficiência com Pouco Tempo":
     Essa análise identifica jogadores que, mesmo com tempo reduzido em campo, conseguiram gerar impacto significativo em termos ofensivos. Isso pode indicar bons finalizadores, atletas com entrada decisiva em jogos ou com bom aproveitamento de chances.
     """)
 
+# Tempo das etapas (só com ?perfil=1 na URL)
+painel_lateral()
@@ -0,0 +1,50 @@
+import streamlit as st
+
+from analise.dados import carregar_por_90, iniciar_vigia
+from analise.metricas import iniciar_endpoint, medir, painel_lateral
+from analise.por90 import MINUTOS_MINIMOS_PADRAO
+
+st.set_page_config(page_title="Por 90 minutos", layout="wide")
+iniciar_vigia()
+iniciar_endpoint()
+
+st.title("🏅 Rankings por 90 minutos")
+st.markdown(
+    "Totais favorecem quem joga mais. Aqui cada estatística é dividida pelos minutos jogados e "
+    "multiplicada por 90, e quem jogou menos que o mínimo escolhido fica fora do ranking. "
+    "Quem jogou por mais de um clube aparece uma vez por clube."
+)
+
+# Taxas e ordem de todas as estatísticas, calculadas uma vez por versão da base
+with medir("por90.carga"):
+    por90 = carregar_por_90()
+
+
+def rotulo(coluna):
+    return coluna.removeprefix("statistics_").replace("_", " ").capitalize()
+
+
+colunas = list(por90.taxas.columns)
+coluna = st.sidebar.selectbox(
+    "Estatística", colunas, index=colunas.index("statistics_goals"), format_func=rotulo
+)
+minutos_minimos = st.sidebar.slider(
+    "Minutos mínimos", 0, int(por90.minutos.max()), min(MINUTOS_MINIMOS_PADRAO, int(por90.minutos.max())), step=90
+)
+top = st.sidebar.slider("Jogadores", 5, 50, 10, step=5)
+
+with medir("por90.ranking"):
+    ranking = por90.ranking(coluna, minutos_minimos, top)
+
+if ranking.empty:
+    st.info("Nenhum jogador com esse mínimo de minutos.")
+else:
+    st.subheader(f"{rotulo(coluna)} por 90 minutos")
+    # Rótulo "Jogador (Clube)": quem passou por dois clubes aparece em cada um
+    barras = ranking[f"{coluna}_por_90"]
+    barras.index = [f"{jogador} ({clube})" for clube, jogador in barras.index]
+    st.bar_chart(barras, horizontal=True)
+    st.dataframe(ranking.round(3))
+
+# Tempo das etapas (só com ?perfil=1 na URL)
+painel_lateral()
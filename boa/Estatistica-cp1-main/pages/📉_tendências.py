@@ -0,0 +1,54 @@
+import streamlit as st
+
+from analise.dados import carregar_tendencias, iniciar_vigia
+from analise.forma import JANELA_PADRAO
+from analise.metricas import iniciar_endpoint, medir, painel_lateral
+
+st.set_page_config(page_title="Tendências", layout="wide")
+iniciar_vigia()
+iniciar_endpoint()
+
+st.title("📉 Tendências de forma")
+
+# Médias já calculadas para todas as partidas; quando a base recebe jogos novos só o fim das séries é recalculado
+with medir("tendencias.carga"):
+    tendencias = carregar_tendencias()
+
+METRICAS = {
+    "nota": "Nota",
+    "xg": "xG por partida",
+    "ga_por_90": "Gols + assistências por 90 min",
+    "passe_certo": "Passes certos (%)",
+}
+TIPOS = {"movel": f"Média móvel ({JANELA_PADRAO} jogos)", "ewm": "Média exponencial"}
+
+clubes = sorted(tendencias.clube.tabela["time_alvo"].unique())
+clube = st.sidebar.selectbox("Clube", clubes)
+metrica = st.sidebar.selectbox("Métrica", list(METRICAS), format_func=METRICAS.get)
+tipo = st.sidebar.radio("Média", list(TIPOS), format_func=TIPOS.get)
+coluna = f"{metrica}_{tipo}"
+
+
+def rotulo(serie):
+    # Eixo x: "ano-jogo", na ordem das partidas
+    return serie["ano"].astype(str) + "-" + serie["jogo"].astype(str).str.zfill(2)
+
+
+st.subheader(f"Forma do {clube}")
+with medir("tendencias.clube"):
+    serie = tendencias.clube.serie(time_alvo=clube)
+    st.line_chart(serie.set_index(rotulo(serie))[coluna].rename(METRICAS[metrica]))
+
+st.subheader("Forma por jogador")
+jogadores_do_clube = tendencias.jogadores.serie(time_alvo=clube)
+# Por padrão, os cinco jogadores com mais partidas
+mais_jogos = jogadores_do_clube["player_name"].value_counts().index.tolist()
+jogadores = st.multiselect("Jogadores", mais_jogos, default=mais_jogos[:5])
+if jogadores:
+    with medir("tendencias.jogadores"):
+        linhas = jogadores_do_clube[jogadores_do_clube["player_name"].isin(jogadores)]
+        tabela = linhas.assign(partida=rotulo(linhas)).pivot(index="partida", columns="player_name", values=coluna)
+        st.line_chart(tabela)
+
+# Tempo das etapas (só com ?perfil=1 na URL)
+painel_lateral()
@@ -0,0 +1,59 @@
+import streamlit as st
+
+from analise.banco import arquivo_banco, consultar, selecionar
+from analise.dados import fonte_padrao
+from analise.metricas import iniciar_endpoint, medir, painel_lateral
+
+st.set_page_config(page_title="Consultas", layout="wide")
+iniciar_endpoint()
+st.title("🔎 Consultas avulsas")
+
+# As consultas rodam no banco SQLite indexado, sem carregar a base inteira na memória
+banco = arquivo_banco(fonte_padrao())
+if not banco.exists():
+    st.info("O banco de consultas ainda não foi criado. Rode `python -m analise.banco` na pasta do app.")
+    painel_lateral()
+    st.stop()
+
+with medir("consultas.opcoes"):
+    jogadores = consultar(banco, "SELECT DISTINCT player_name FROM partidas WHERE player_name IS NOT NULL ORDER BY player_name")
+    anos = consultar(banco, "SELECT DISTINCT ano FROM partidas ORDER BY ano")
+
+jogador = st.sidebar.selectbox("Jogador", jogadores["player_name"])
+temporada = st.sidebar.selectbox("Temporada", ["Todas"] + anos["ano"].tolist())
+ano = None if temporada == "Todas" else temporada
+
+st.subheader(f"Partidas de {jogador}")
+with medir("consultas.partidas"):
+    partidas = selecionar(
+        banco,
+        ["ano", "jogo", "home_team", "away_team", "tournament", "player_position",
+         "statistics_minutes_played", "statistics_rating", "statistics_goals", "statistics_goal_assist"],
+        ordem=["ano", "jogo"],
+        player_name=jogador,
+        ano=ano,
+    )
+st.dataframe(partidas)
+
+st.subheader("Resumo por posição")
+with medir("consultas.resumo"):
+    resumo = consultar(
+        banco,
+        """
+        SELECT player_position AS posicao,
+               COUNT(DISTINCT player_name) AS jogadores,
+               SUM(statistics_minutes_played) AS minutos,
+               SUM(statistics_goals) AS gols,
+               SUM(statistics_goal_assist) AS assistencias,
+               ROUND(AVG(statistics_rating), 2) AS nota_media
+        FROM partidas
+        WHERE player_position IS NOT NULL AND (:ano IS NULL OR ano = :ano)
+        GROUP BY player_position
+        ORDER BY player_position
+        """,
+        {"ano": ano},
+    )
+st.dataframe(resumo)
+
+# Tempo das etapas (só com ?perfil=1 na URL)
+painel_lateral()
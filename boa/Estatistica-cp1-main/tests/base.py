@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+
+def base_sintetica(clubes=2, jogadores=6, anos=(2022, 2023), jogos=6, semente=0):
+    """Base pequena com as colunas usadas pelos testes: cada jogador do clube em todas as partidas."""
+    rng = np.random.default_rng(semente)
+    linhas = []
+    for c in range(clubes):
+        for ano in anos:
+            for jogo in range(1, jogos + 1):
+                for j in range(jogadores):
+                    linhas.append({"time_alvo": f"Clube {c}", "ano": ano, "jogo": jogo, "player_name": f"Jogador {c}-{j}"})
+    df = pd.DataFrame(linhas)
+    n = len(df)
+    # Reservas que não entram em campo e notas ausentes, como na base real
+    df["statistics_minutes_played"] = np.where(rng.random(n) < 0.15, 0, rng.integers(1, 91, n))
+    df["statistics_rating"] = np.where(rng.random(n) < 0.1, np.nan, rng.uniform(5, 9, n).round(1))
+    df["statistics_expected_goals"] = rng.exponential(0.2, n).round(4)
+    df["statistics_goals"] = rng.poisson(0.2, n)
+    df["statistics_goal_assist"] = rng.poisson(0.15, n)
+    df["statistics_total_pass"] = rng.integers(0, 60, n)
+    df["statistics_accurate_pass"] = (df["statistics_total_pass"] * rng.uniform(0.5, 1, n)).astype(int)
+    df["home_or_away"] = np.where(df["jogo"] % 2 == 0, "home", "away")
+    df["player_position"] = rng.choice(["G", "D", "M", "F"], n)
+    return df
+
+
+def base_com_partidas(semente=0, **kwargs):
+    """base_sintetica com torneio, mandante, visitante e o adversário derivado deles (analise.cubo.com_adversario)."""
+    from analise.cubo import com_adversario
+
+    df = base_sintetica(semente=semente, **kwargs)
+    rng = np.random.default_rng(semente + 1)
+    # Um adversário e um torneio por partida, iguais para todos os jogadores dela
+    partidas = df.groupby(["time_alvo", "ano", "jogo"]).ngroup().to_numpy()
+    adversarios = rng.choice(["Santos", "Guarani", "Ponte Preta", "Mirassol"], partidas.max() + 1)[partidas]
+    torneios = rng.choice(["Paulista", "Série B", None], partidas.max() + 1)[partidas]
+    casa = df["home_or_away"] == "home"
+    df["home_team"] = np.where(casa, df["time_alvo"], adversarios)
+    df["away_team"] = np.where(casa, adversarios, df["time_alvo"])
+    df["tournament"] = pd.Series(torneios, index=df.index, dtype="category")
+    return com_adversario(df)
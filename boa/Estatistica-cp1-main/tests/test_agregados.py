@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analise.agregados import DIMENSOES, acumular, colunas_estatisticas, construir_agregados, finalizar, somar_acumulados
+from analise.blocos import agregar_em_blocos
+from analise.dados import carregar_dados
+from analise.ingestao import converter
+from tests.base import base_sintetica
+
+
+@pytest.fixture
+def base():
+    return base_sintetica(clubes=3, semente=1)
+
+
+def agregados_pandas(df):
+    # Referência: as mesmas estatísticas suficientes com groupby em float64, coluna a coluna
+    colunas = colunas_estatisticas(df)
+    valores = df[colunas].astype("float64")
+    minutos = df["statistics_minutes_played"].astype("float64").fillna(0)
+    grupos = [df[c] for c in DIMENSOES]
+    return {
+        "soma": valores.groupby(grupos).sum(),
+        "n": valores.notna().groupby(grupos).sum(),
+        "quadrados": (valores ** 2).groupby(grupos).sum(),
+        "peso": valores.notna().mul(minutos, axis=0).groupby(grupos).sum(),
+        "ponderada": valores.mul(minutos, axis=0).groupby(grupos).sum(),
+    }
+
+
+def test_ponto_fixo_igual_ao_pandas(base):
+    tabela = construir_agregados(base)
+    for nivel, esperado in agregados_pandas(base).items():
+        pd.testing.assert_frame_equal(tabela[nivel], esperado, check_dtype=False, check_names=False, rtol=1e-12)
+
+
+def test_soma_dos_blocos_nao_depende_da_ordem(base):
+    embaralhada = base.sample(frac=1, random_state=0)
+    partes = [acumular(embaralhada.iloc[linhas]) for linhas in np.array_split(np.arange(len(embaralhada)), 7)]
+    pd.testing.assert_frame_equal(finalizar(somar_acumulados(*partes)), construir_agregados(base))
+
+
+@pytest.mark.parametrize("sufixo", [".csv", ".parquet", ".arrow"])
+def test_agregacao_em_blocos_igual_a_em_memoria(base, tmp_path, sufixo):
+    caminho = tmp_path / "base.csv"
+    base.to_csv(caminho, index=False)
+    if sufixo != ".csv":
+        caminho, _ = converter(caminho, tmp_path / f"base{sufixo}")
+
+    em_memoria = construir_agregados(carregar_dados(caminho))
+    em_blocos = agregar_em_blocos(caminho, linhas_por_bloco=37)
+    pd.testing.assert_frame_equal(em_blocos, em_memoria, check_index_type=False, check_categorical=False)
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+from analise.banco import arquivo_banco, criar_banco, selecionar
+from tests.base import base_sintetica
+
+
+@pytest.fixture
+def banco(tmp_path):
+    base = base_sintetica()
+    origem = tmp_path / "base.csv"
+    base.to_csv(origem, index=False)
+    criar_banco(origem)
+    return base, arquivo_banco(origem)
+
+
+def test_arquivo_banco_por_fonte(tmp_path):
+    assert arquivo_banco(tmp_path / "base.csv") != arquivo_banco(tmp_path / "base.parquet")
+
+
+def test_selecionar_igual_ao_pandas(banco):
+    base, caminho = banco
+    obtido = selecionar(caminho, ["player_name", "jogo", "statistics_goals"], ordem=["jogo", "player_name"],
+                        ano=2023, player_position=["G", "D"])
+    esperado = base[(base["ano"] == 2023) & base["player_position"].isin(["G", "D"])]
+    esperado = esperado.sort_values(["jogo", "player_name"])[["player_name", "jogo", "statistics_goals"]]
+    pd.testing.assert_frame_equal(obtido, esperado.reset_index(drop=True), check_dtype=False)
+
+
+@pytest.mark.parametrize("argumentos", [
+    {"campos": ["nao_existe"]},
+    {"ordem": ["player_name; DROP TABLE partidas"]},
+    {'player_name" OR 1=1 --': "x"},
+])
+def test_selecionar_recusa_colunas_fora_do_esquema(banco, argumentos):
+    _, caminho = banco
+    with pytest.raises(KeyError):
+        selecionar(caminho, **argumentos)
+    assert len(selecionar(caminho, ["jogo"])) > 0
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from analise.bootstrap import bootstrap_ic, bootstrap_por_grupo
+from tests.base import base_sintetica
+
+
+def bca_por_laco(x, estatistica, n_reamostras, confianca, semente):
+    # Referência: uma reamostra por vez (mesma sequência do gerador) e jackknife com np.delete
+    rng = np.random.default_rng(semente)
+    n = len(x)
+    reamostras = np.array([estatistica(x[rng.integers(0, n, size=n)]) for _ in range(n_reamostras)])
+    estimativa = estatistica(x)
+    proporcao = np.clip(np.mean(reamostras < estimativa), 1 / n_reamostras, 1 - 1 / n_reamostras)
+    z0 = stats.norm.ppf(proporcao)
+    jack = np.array([estatistica(np.delete(x, i)) for i in range(n)])
+    desvios = jack.mean() - jack
+    a = np.sum(desvios ** 3) / (6 * np.sum(desvios ** 2) ** 1.5)
+    alfa = (1 - confianca) / 2
+    limites = []
+    for z in stats.norm.ppf([alfa, 1 - alfa]):
+        limites.append(np.quantile(reamostras, stats.norm.cdf(z0 + (z0 + z) / (1 - a * (z0 + z)))))
+    return estimativa, *limites
+
+
+@pytest.mark.parametrize("estatistica", [np.mean, np.median])
+def test_bca_igual_ao_laco(estatistica):
+    # Assimétrica, como gols e xG
+    x = np.random.default_rng(3).exponential(0.4, 60)
+    obtido = bootstrap_ic(x, estatistica, n_reamostras=999, metodo="bca", semente=11)
+    np.testing.assert_allclose(obtido, bca_por_laco(x, estatistica, 999, 0.95, 11), rtol=1e-12)
+
+
+def test_bca_em_blocos_igual_ao_laco(monkeypatch):
+    # Blocos menores que o número de reamostras e de linhas do jackknife
+    monkeypatch.setattr("analise.bootstrap.ELEMENTOS_POR_BLOCO", 500)
+    x = np.random.default_rng(4).normal(6.5, 0.8, 80)
+    obtido = bootstrap_ic(x, np.mean, n_reamostras=500, metodo="bca", semente=5)
+    np.testing.assert_allclose(obtido, bca_por_laco(x, np.mean, 500, 0.95, 5), rtol=1e-12)
+
+
+def test_por_grupo_igual_com_e_sem_processos():
+    df = base_sintetica().dropna(subset=["statistics_rating"])
+    argumentos = dict(coluna="statistics_rating", n_reamostras=200, metodo="bca", semente=7)
+    sem_processos = bootstrap_por_grupo(df, processos=1, **argumentos)
+    # Cada grupo usa a própria semente: calcular um grupo sozinho dá o mesmo intervalo
+    nome, valores = next(iter(df.groupby("player_name")["statistics_rating"]))
+    semente = np.random.SeedSequence(7).spawn(df["player_name"].nunique())[0]
+    esperado = bootstrap_ic(valores, np.mean, 200, metodo="bca", semente=semente)
+    np.testing.assert_allclose(sem_processos.loc[nome, ["estimativa", "inferior", "superior"]], esperado)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analise.cubo import Cubo
+from tests.base import base_com_partidas
+
+COLUNAS = ["statistics_rating", "statistics_goals", "statistics_minutes_played"]
+CONSULTAS = [
+    ((), {}),
+    ((), {"ano": 2022, "home_or_away": "home"}),
+    (("ano",), {}),
+    (("tournament", "ano"), {"home_or_away": "home"}),
+    (("player_position",), {"adversario": ["Santos", "Guarani"], "tournament": "Série B"}),
+    (("time_alvo", "adversario", "home_or_away"), {"player_position": ["D", "M"]}),
+    (("ano", "home_or_away"), {"ano": 2023, "home_or_away": None}),
+]
+
+
+def _direto(df, por, filtros):
+    # Referência: filtra as linhas e agrupa com o pandas
+    mascara = pd.Series(True, index=df.index)
+    for coluna, valor in filtros.items():
+        if valor is not None:
+            mascara &= df[coluna].isin(valor if isinstance(valor, list) else [valor])
+    linhas = df.loc[mascara, COLUNAS]
+    partes = {"soma": linhas, "n": linhas.notna(), "quadrados": linhas ** 2}
+    if not por:
+        return pd.concat({nivel: valores.sum().to_frame().T for nivel, valores in partes.items()}, axis=1)
+    chaves = [df.loc[mascara, d] for d in por]
+    return pd.concat(
+        {nivel: valores.groupby(chaves, observed=True, dropna=False).sum() for nivel, valores in partes.items()}, axis=1
+    )
+
+
+def _comparar(obtido, esperado):
+    obtido = obtido[esperado.columns]
+    if esperado.index.nlevels > 1:
+        obtido = obtido.reorder_levels(esperado.index.names)
+    obtido, esperado = obtido.sort_index(), esperado.sort_index()
+    assert obtido.index.equals(esperado.index)
+    np.testing.assert_allclose(obtido.to_numpy(dtype="float64"), esperado.to_numpy(dtype="float64"), rtol=1e-9)
+
+
+@pytest.mark.parametrize(("por", "filtros"), CONSULTAS)
+def test_fatia_igual_ao_groupby(por, filtros):
+    df = base_com_partidas(semente=4)
+    _comparar(Cubo(df).consultar(por=por, **filtros), _direto(df, por, filtros))
+
+
+def test_roll_up_a_partir_de_agregacao_materializada():
+    df = base_com_partidas(semente=4)
+    cubo = Cubo(df)
+    cubo.consultar(por=("ano", "tournament", "home_or_away"))
+    # Tirar dimensões de `por` parte da agregação já montada, não da base
+    _comparar(cubo.consultar(por=("ano",), home_or_away="away"), _direto(df, ("ano",), {"home_or_away": "away"}))
+    _comparar(cubo.consultar(por=("tournament",)), _direto(df, ("tournament",), {}))
+    assert cubo.tamanho()["agregacoes"] == 3
+
+
+def test_orcamento_minimo_mantem_resultados():
+    df = base_com_partidas(semente=4)
+    cubo = Cubo(df, limite_bytes=1)
+    for por, filtros in CONSULTAS[2:]:
+        _comparar(cubo.consultar(por=por, **filtros), _direto(df, por, filtros))
+    assert cubo.tamanho()["agregacoes"] == 1
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from analise import estatisticas
+from analise.agregados import construir_agregados
+from tests.base import base_sintetica
+
+
+def test_welch_igual_ao_scipy():
+    rng = np.random.default_rng(4)
+    x, y = rng.normal(6.8, 0.5, 40), rng.normal(6.5, 0.9, 25)
+    x[[3, 17]] = np.nan
+    # Momentos de partições separadas, somados, como vêm das células da tabela agregada
+    m1 = estatisticas.momentos(x[:15]) + estatisticas.momentos(x[15:])
+    m2 = estatisticas.momentos(y)
+    esperado = stats.ttest_ind(x, y, equal_var=False, nan_policy="omit")
+    assert estatisticas.teste_t(m1, m2) == pytest.approx((esperado.statistic, esperado.pvalue), rel=1e-9)
+
+    presentes = x[~np.isnan(x)]
+    media, inferior, superior = estatisticas.intervalo_confianca(m1)
+    erro = stats.norm.ppf(0.975) * presentes.std(ddof=1) / np.sqrt(len(presentes))
+    assert (media, inferior, superior) == pytest.approx((presentes.mean(), presentes.mean() - erro, presentes.mean() + erro))
+
+
+def test_momentos_do_recorte_iguais_aos_das_linhas():
+    df = base_sintetica(semente=5)
+    tabela = construir_agregados(df)
+    linhas = df[(df["home_or_away"] == "home") & (df["ano"] == 2023)]
+    m = estatisticas.momentos_do_recorte(tabela, "statistics_rating", home_or_away="home", ano=2023)
+    direto = estatisticas.momentos(linhas["statistics_rating"], linhas["statistics_minutes_played"])
+    for campo in ("n", "soma", "quadrados", "peso", "ponderada"):
+        assert getattr(m, campo) == pytest.approx(getattr(direto, campo), rel=1e-9)
+    notas = linhas["statistics_rating"].dropna()
+    assert m.variancia == pytest.approx(notas.var(ddof=1), rel=1e-9)
+
+
+def test_permutacao_igual_ao_scipy():
+    rng = np.random.default_rng(0)
+    x, y = rng.normal(6.6, 0.7, 9), rng.normal(6.3, 0.7, 8)
+    # Referência exata: todas as divisões das 17 notas em 9 + 8, estatística |diferença de médias|
+    esperado = stats.permutation_test(
+        (x, y), lambda a, b, axis: np.abs(a.mean(axis=axis) - b.mean(axis=axis)),
+        alternative="greater", n_resamples=np.inf, vectorized=True,
+    )
+    diferenca, p_value, feitas = estatisticas.teste_permutacao(x, y, n_permutacoes=20000, semente=1)
+    assert diferenca == pytest.approx(x.mean() - y.mean())
+    assert feitas >= 1000
+    # Monte Carlo contra o exato: bem dentro de 4 erros-padrão
+    assert abs(p_value - esperado.pvalue) < 4 * np.sqrt(esperado.pvalue * (1 - esperado.pvalue) / feitas) + 1 / feitas
+
+
+def test_permutacao_nao_para_no_primeiro_bloco(monkeypatch):
+    # Amostras "grandes" para o tamanho do bloco: 2 permutações por bloco
+    monkeypatch.setattr("analise.estatisticas.ELEMENTOS_POR_BLOCO", 400)
+    rng = np.random.default_rng(2)
+    x, y = rng.normal(6.5, 0.7, 100), rng.normal(6.5, 0.7, 100)
+    _, _, feitas = estatisticas.teste_permutacao(x, y, n_permutacoes=5000, semente=3)
+    assert feitas >= 1000
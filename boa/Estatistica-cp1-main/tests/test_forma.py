@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analise import dados
+from analise.forma import COLUNAS_FORMA, METRICAS, ORDEM, Tendencias, partidas_jogadas
+from tests.base import base_sintetica
+
+
+def ordenar(tabela, chave):
+    return tabela.sort_values([*chave, *ORDEM]).reset_index(drop=True)
+
+
+def forma_pandas(partidas, chave, janela=5, alfa=0.3):
+    # Referência: rolling e ewm do pandas, um grupo por vez
+    series = []
+    for _, grupo in partidas.sort_values(ORDEM).groupby(chave):
+        serie = grupo[[*chave, *ORDEM]].copy()
+        for metrica in METRICAS:
+            num, den = grupo[f"{metrica}_num"], grupo[f"{metrica}_den"]
+            movel = den.rolling(janela, min_periods=1).sum()
+            ewm = den.ewm(alpha=alfa).mean()
+            serie[f"{metrica}_movel"] = num.rolling(janela, min_periods=1).sum() / movel.where(movel > 0)
+            serie[f"{metrica}_ewm"] = num.ewm(alpha=alfa).mean() / ewm.where(ewm > 0)
+        series.append(serie)
+    return ordenar(pd.concat(series), chave)
+
+
+def assert_tendencias_iguais(a, b):
+    for forma in ("jogadores", "clube"):
+        x, y = getattr(a, forma), getattr(b, forma)
+        pd.testing.assert_frame_equal(ordenar(x.tabela, x.chave), ordenar(y.tabela, y.chave), rtol=1e-9)
+
+
+@pytest.fixture
+def partidas():
+    return partidas_jogadas(base_sintetica())
+
+
+def test_forma_igual_ao_pandas(partidas):
+    tendencias = Tendencias().atualizar(partidas)
+    jogadores = tendencias.jogadores
+    pd.testing.assert_frame_equal(
+        ordenar(jogadores.tabela, jogadores.chave), forma_pandas(partidas, jogadores.chave), check_dtype=False, rtol=1e-9
+    )
+
+
+@pytest.mark.parametrize("partidas_novas", [1, 4])
+def test_anexo_igual_ao_recalculo(partidas, partidas_novas):
+    posicao = partidas["ano"] * 100_000 + partidas["jogo"]
+    corte = np.sort(posicao.unique())[-partidas_novas]
+    antes = Tendencias().atualizar(partidas[posicao < corte])
+    assert_tendencias_iguais(antes.atualizar(partidas), Tendencias().atualizar(partidas))
+
+
+def test_nota_editada_em_partida_antiga(partidas):
+    tendencias = Tendencias().atualizar(partidas)
+    editadas = partidas.copy()
+    editadas.loc[editadas.index[0], "nota_num"] = 9.9
+    with pytest.raises(ValueError):
+        tendencias.jogadores.novas(editadas)
+
+
+def test_jogador_incluido_em_partida_antiga(partidas):
+    tendencias = Tendencias().atualizar(partidas)
+    linha = partidas.iloc[[0]].assign(player_name="Jogador novo")
+    # Para o jogador é uma série nova; a partida do clube, já calculada, é que mudou
+    incluidas = pd.concat([partidas, linha], ignore_index=True)
+    tendencias.jogadores.novas(incluidas)
+    with pytest.raises(ValueError):
+        tendencias.atualizar(incluidas)
+
+
+def test_base_editada_recalcula_do_zero(tmp_path):
+    base = base_sintetica()
+    caminho = tmp_path / "base.csv"
+    base.to_csv(caminho, index=False)
+    dados.carregar_tendencias(caminho)
+
+    base.loc[base["statistics_minutes_played"] > 0, "statistics_rating"] = 9.9
+    base.to_csv(caminho, index=False)
+    # Mesma leitura (e mesmos tipos) do app, calculada sem o estado anterior
+    esperado = Tendencias().atualizar(partidas_jogadas(dados.carregar_dados(caminho, COLUNAS_FORMA)))
+    tendencias = dados.carregar_tendencias(caminho)
+    assert_tendencias_iguais(tendencias, esperado)
+    assert tendencias.clube.tabela["nota_ewm"].round(3).eq(9.9).all()
@@ -0,0 +1,68 @@
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from analise import graficos
+from analise.graficos import CacheGraficos
+
+
+def test_descarta_o_menos_usado_dentro_do_orcamento():
+    cache = CacheGraficos(limite_bytes=100)
+    for chave in "abc":
+        cache.guardar(chave, bytes(30))
+    # "a" acabou de ser usado, então o descartado para caber "d" é "b"
+    assert cache.obter("a") is not None
+    cache.guardar("d", bytes(30))
+    assert cache.obter("b") is None
+    assert all(cache.obter(c) is not None for c in "acd")
+    assert cache.tamanho()["bytes"] == 90
+
+    # Um item grande tira quantos forem preciso, dos menos usados para os mais usados
+    cache.guardar("e", bytes(70))
+    assert cache.obter("a") is None and cache.obter("c") is None
+    assert cache.obter("d") is not None
+    assert cache.tamanho()["bytes"] == 100
+
+    # Regravar a mesma chave troca o tamanho, não soma
+    cache.guardar("e", bytes(10))
+    assert cache.tamanho()["bytes"] == 40
+
+
+def test_item_maior_que_o_orcamento_nao_entra():
+    cache = CacheGraficos(limite_bytes=100)
+    cache.guardar("a", bytes(60))
+    cache.guardar("grande", bytes(101))
+    assert cache.obter("grande") is None
+    assert cache.obter("a") is not None
+    assert cache.tamanho()["bytes"] == 60
+
+
+def test_descartar_desconta_os_bytes():
+    cache = CacheGraficos(limite_bytes=1000)
+    for versao in (1, 2):
+        for pergunta in range(3):
+            cache.guardar((pergunta, versao), bytes(10 * (pergunta + 1)))
+    cache.descartar(lambda chave: chave[1] == 1)
+    tamanho = cache.tamanho()
+    assert (tamanho["itens"], tamanho["bytes"]) == (3, 60)
+    assert cache.obter((0, 1)) is None and cache.obter((0, 2)) is not None
+
+
+def test_renderizar_desenha_uma_vez_e_fecha_a_figura(monkeypatch):
+    monkeypatch.setattr(graficos, "cache_graficos", CacheGraficos())
+    chamadas = []
+
+    def desenhar():
+        chamadas.append(1)
+        fig, ax = plt.subplots()
+        ax.plot([1, 2, 3])
+        return fig
+
+    abertas = len(plt.get_fignums())
+    primeira = graficos.renderizar(("teste", 1), desenhar)
+    assert graficos.renderizar(("teste", 1), desenhar) == primeira
+    assert primeira.startswith(b"\x89PNG")
+    assert len(chamadas) == 1
+    assert len(plt.get_fignums()) == abertas
+    assert graficos.cache_graficos.tamanho()["hits"] == 1
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analise.indices import construir_indices, filtrar_linhas, posicoes
+from tests.base import base_com_partidas
+
+FILTROS = [
+    {},
+    {"ano": 2023},
+    {"home_or_away": "home", "player_position": ["D", "F"]},
+    {"ano": [2022, 2023], "tournament": "Série B", "adversario": ["Santos", "Mirassol"]},
+    {"player_position": "G", "home_or_away": "away", "ano": 2022, "tournament": ["Paulista", "Série B"]},
+    {"adversario": "Santos", "player_position": None},
+    # Valor que não existe na base: nenhuma linha
+    {"ano": 1999, "home_or_away": "home"},
+]
+
+
+@pytest.mark.parametrize("filtros", FILTROS)
+def test_filtro_igual_a_mascara(filtros):
+    df = base_com_partidas(semente=3)
+    indices = construir_indices(df)
+
+    mascara = pd.Series(True, index=df.index)
+    for coluna, valor in filtros.items():
+        if valor is not None:
+            mascara &= df[coluna].isin(valor if isinstance(valor, list) else [valor])
+    esperado = df[mascara]
+
+    pd.testing.assert_frame_equal(filtrar_linhas(df, indices, **filtros), esperado)
+    linhas = posicoes(indices, **filtros)
+    if linhas is not None:
+        np.testing.assert_array_equal(linhas, np.flatnonzero(mascara))
+
+
+def test_linhas_sem_valor_nao_entram_em_nenhum_filtro():
+    df = base_com_partidas(semente=3)
+    indices = construir_indices(df)
+    com_torneio = sum(len(linhas) for linhas in indices["tournament"].values())
+    assert com_torneio == df["tournament"].notna().sum()
+    assert set(indices) == {"player_position", "home_or_away", "ano", "tournament", "adversario"}
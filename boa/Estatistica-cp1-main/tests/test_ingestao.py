@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+
+from analise import dados
+from analise.agregados import construir_agregados
+from analise.ingestao import CHAVE, anexar, converter
+from tests.base import base_sintetica
+
+
+@pytest.mark.parametrize("sufixo", [".csv", ".parquet", ".arrow"])
+def test_anexo_deduplica_e_iguala_a_reconstrucao(tmp_path, sufixo):
+    base = base_sintetica(semente=2)
+    posicao = base["ano"] * 100 + base["jogo"]
+    antigas, novas = base[posicao < posicao.max() - 2], base[posicao >= posicao.max() - 2]
+
+    caminho = tmp_path / "base.csv"
+    antigas.to_csv(caminho, index=False)
+    if sufixo != ".csv":
+        caminho, _ = converter(caminho, tmp_path / f"base{sufixo}")
+    dados.carregar_agregados(caminho)
+
+    # Lote com linhas já ingeridas e repetidas dentro dele: só as partidas novas entram, uma vez cada
+    lote = pd.concat([antigas.tail(30), novas, novas.head(10)])
+    lote.to_csv(tmp_path / "lote.csv", index=False)
+    assert anexar(tmp_path / "lote.csv", caminho) == len(novas)
+    assert anexar(tmp_path / "lote.csv", caminho) == 0
+
+    completa = dados.carregar_dados(caminho)
+    assert len(completa) == len(base)
+    assert not completa.duplicated(subset=CHAVE).any()
+    # Tabela atualizada só com as linhas novas = tabela montada do zero com a base inteira
+    pd.testing.assert_frame_equal(
+        dados.carregar_agregados(caminho).sort_index(), construir_agregados(completa).sort_index(),
+        check_index_type=False, check_categorical=False, rtol=1e-9,
+    )
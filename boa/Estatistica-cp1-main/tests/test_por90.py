@@ -0,0 +1,23 @@
+import pandas as pd
+
+from analise.agregados import construir_agregados
+from analise.por90 import DIMENSOES_POR_90, Por90
+from tests.base import base_sintetica
+
+
+def test_ranking_igual_ao_pandas_por_clube():
+    base = base_sintetica(clubes=3)
+    # O mesmo jogador em dois clubes continua separado, uma linha por clube
+    base.loc[base["time_alvo"] == "Clube 1", "player_name"] = base["player_name"].str.replace("1-", "0-")
+    por90 = Por90(construir_agregados(base, DIMENSOES_POR_90))
+
+    soma = base.groupby(DIMENSOES_POR_90)[["statistics_goals", "statistics_minutes_played"]].sum()
+    soma = soma[soma["statistics_minutes_played"] >= 200]
+    esperado = (soma["statistics_goals"] * 90 / soma["statistics_minutes_played"]).sort_values(ascending=False, kind="stable")
+
+    ranking = por90.ranking("statistics_goals", minutos_minimos=200, top=len(esperado))
+    assert ranking.index.names == DIMENSOES_POR_90
+    assert ("Clube 0", "Jogador 0-0") in ranking.index and ("Clube 1", "Jogador 0-0") in ranking.index
+    pd.testing.assert_series_equal(
+        ranking["statistics_goals_por_90"], esperado, check_names=False, check_index_type=False, check_exact=False
+    )
@@ -0,0 +1,90 @@
+import hashlib
+import os
+import time
+
+import pytest
+
+from analise import versao
+from analise.versao import hash_do_arquivo, impressao_digital
+
+
+def hash_completo(caminho):
+    return hashlib.blake2b(caminho.read_bytes(), digest_size=16).hexdigest()
+
+
+@pytest.fixture
+def leituras(monkeypatch):
+    # Conta os bytes que analise.versao lê do disco
+    lidos = []
+    abrir = open
+
+    class Arquivo:
+        def __init__(self, *args):
+            self._arquivo = abrir(*args)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            self._arquivo.close()
+
+        def seek(self, posicao):
+            return self._arquivo.seek(posicao)
+
+        def read(self, tamanho=-1):
+            dados = self._arquivo.read(tamanho)
+            lidos.append(len(dados))
+            return dados
+
+    monkeypatch.setattr(versao, "open", Arquivo, raising=False)
+    return lidos
+
+
+@pytest.fixture
+def arquivo(tmp_path):
+    caminho = tmp_path / "base.csv"
+    caminho.write_bytes(os.urandom(2 * 1024 * 1024))
+    hash_do_arquivo(caminho)
+    return caminho
+
+
+def test_anexo_le_so_os_bytes_novos(arquivo, leituras):
+    with open(arquivo, "ab") as saida:
+        saida.write(os.urandom(1000))
+    assert hash_do_arquivo(arquivo) == hash_completo(arquivo)
+    # Conferência da cauda antiga + bytes novos + cauda nova; nada do começo do arquivo
+    assert sum(leituras) <= 2 * versao.BYTES_DA_CAUDA + 1000
+
+
+def test_arquivo_reescrito_e_relido_inteiro(arquivo, leituras):
+    conteudo = bytearray(arquivo.read_bytes())
+    conteudo[-10] ^= 0xFF
+    arquivo.write_bytes(bytes(conteudo) + b"linha nova\n")
+    assert hash_do_arquivo(arquivo) == hash_completo(arquivo)
+    assert sum(leituras) >= len(conteudo)
+
+
+def test_touch_nao_muda_a_impressao(arquivo):
+    antes = impressao_digital(arquivo)
+    os.utime(arquivo, ns=(0, 0))
+    assert impressao_digital(arquivo) == antes
+
+
+def test_vigia_avisa_falha_ao_reaquecer(arquivo, caplog):
+    def ao_mudar(caminho, antiga, nova):
+        raise RuntimeError("remontagem falhou")
+
+    vigia = versao.Vigia(ao_mudar, intervalo=0.01)
+    vigia.observar(arquivo, ("versão", "antiga"))
+    with caplog.at_level("WARNING", logger="analise.versao"):
+        vigia.iniciar()
+        try:
+            for _ in range(200):
+                if caplog.records:
+                    break
+                time.sleep(0.01)
+        finally:
+            vigia.parar()
+    assert "remontagem falhou" in caplog.text
+    # A vigia continua com a versão nova, sem repetir o aviso a cada volta
+    assert vigia.versao(arquivo.resolve()) == impressao_digital(arquivo)